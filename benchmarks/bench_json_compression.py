@@ -0,0 +1,79 @@
+"""
+Benchmark for JSON rendering and response compression.
+
+Renders a /log-history/-like payload with DRF's stdlib JSONRenderer and with FastJSONRenderer,
+then compares the bytes on the wire uncompressed, gzipped and brotli-compressed (when the
+brotli package is installed), with the time each encoding takes.
+
+Usage:
+    $ python benchmarks/bench_json_compression.py [number_of_entries]
+"""
+import gzip
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notification_service_backend.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from notifications import middleware  # noqa: E402
+from notifications.renderers import FastJSONRenderer, orjson  # noqa: E402
+
+
+def timed(func, repeat=5):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def build_payload(total):
+    category = str(uuid.uuid4())
+    message = {'id': str(uuid.uuid4()), 'message': 'Hello, news about sport!', 'category': category,
+               'send_at': None, 'sent_at': timezone.now().isoformat()}
+    return [
+        {'id': str(uuid.uuid4()), 'time': timezone.now().isoformat(), 'user': 'user{}'.format(index % 1000),
+         'channel_type': 'SMS' if index % 2 else 'E-Mail', 'status': 'sent', 'message': message}
+        for index in range(total)
+    ]
+
+
+def main(total):
+    payload = build_payload(total)
+    print("Rendering {} log entries".format(total))
+
+    stdlib_ms, content = timed(lambda: JSONRenderer().render(payload))
+    print("{:<28} {:>9.2f} ms".format("stdlib JSONRenderer", stdlib_ms))
+    if orjson is not None:
+        fast_ms, _ = timed(lambda: FastJSONRenderer().render(payload))
+        print("{:<28} {:>9.2f} ms   {:.1f}x faster".format("FastJSONRenderer (orjson)", fast_ms, stdlib_ms / fast_ms))
+    else:
+        print("orjson is not installed; FastJSONRenderer uses the stdlib renderer.")
+
+    print("{:<28} {:>9} bytes".format("identity", len(content)))
+    gzip_ms, compressed = timed(lambda: gzip.compress(content, compresslevel=6))
+    print("{:<28} {:>9} bytes   {:.1f}% of identity, {:.2f} ms".format(
+        "gzip", len(compressed), len(compressed) / len(content) * 100, gzip_ms))
+    if middleware.brotli is not None:
+        quality = settings.COMPRESSION_BROTLI_QUALITY
+        brotli_ms, compressed = timed(lambda: middleware.brotli.compress(content, quality=quality))
+        print("{:<28} {:>9} bytes   {:.1f}% of identity, {:.2f} ms".format(
+            "brotli (quality {})".format(quality), len(compressed), len(compressed) / len(content) * 100, brotli_ms))
+    else:
+        print("brotli is not installed; responses are gzip-compressed.")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
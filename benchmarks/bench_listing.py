@@ -0,0 +1,77 @@
+"""
+Benchmark for the message list endpoint.
+
+Compares the ModelSerializer used before with the values() based read serializer, and an
+uncached /messages/ request with a cached one. Runs against a throwaway test database.
+
+Usage:
+    $ python benchmarks/bench_listing.py [number_of_messages]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notification_service_backend.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from notifications.models import Category, GilaMessage  # noqa: E402
+from notifications.serializers import MessageSerializer, MessageReadSerializer  # noqa: E402
+from notifications.views import MessageListCreateView  # noqa: E402
+
+
+def timed(label, func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print("{:<45} {:>10.2f} ms".format(label, best * 1000))
+    return best
+
+
+def main(total):
+    category = Category.objects.create(name='Bench', description='Benchmark category')
+    GilaMessage.objects.bulk_create(
+        GilaMessage(message='Benchmark message {}'.format(index), category=category) for index in range(total)
+    )
+    print("Listing {} messages".format(total))
+
+    queryset = GilaMessage.objects.order_by('pk')
+    renderer = JSONRenderer()
+    before = timed("ModelSerializer(many=True) + render",
+                   lambda: renderer.render(MessageSerializer(queryset.all(), many=True).data))
+    after = timed("MessageReadSerializer(values()) + render",
+                  lambda: renderer.render(MessageReadSerializer(MessageReadSerializer.values(queryset.all())).data))
+    print("Serialization speed-up: {:.1f}x".format(before / after))
+
+    view = MessageListCreateView.as_view()
+    factory = RequestFactory()
+
+    def uncached():
+        cache.clear()
+        view(factory.get('/messages/', {'page_size': 1000}))
+
+    uncached_time = timed("GET /messages/?page_size=1000 (uncached)", uncached)
+    view(factory.get('/messages/', {'page_size': 1000}))
+    cached_time = timed("GET /messages/?page_size=1000 (cached)",
+                        lambda: view(factory.get('/messages/', {'page_size': 1000})))
+    print("Cached request speed-up: {:.1f}x".format(uncached_time / cached_time))
+
+
+if __name__ == '__main__':
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
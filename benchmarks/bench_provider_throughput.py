@@ -0,0 +1,79 @@
+"""
+Benchmark for fan-out throughput against simulated providers.
+
+Sends one message to synthetic subscribers (one SMS and one e-mail channel each) through the
+regular notify/log pipeline, with the providers replaced by the simulator configured in
+NOTIFICATION_PROVIDER_SIMULATOR, and reports deliveries per second and their outcomes.
+Runs against a throwaway test database.
+
+Usage:
+    $ python benchmarks/bench_provider_throughput.py [number_of_users] [latency_scale]
+
+latency_scale multiplies every simulated latency, e.g. 0.1 for a quick run.
+"""
+import copy
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notification_service_backend.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+
+from notifications.models import Category, GilaMessage  # noqa: E402
+from notifications.utilities.auxiliar_models import User, SMSChannel, EmailChannel, ChannelType  # noqa: E402
+
+
+def scaled_simulator(scale):
+    simulator = copy.deepcopy(settings.NOTIFICATION_PROVIDER_SIMULATOR)
+    for options in simulator.values():
+        latency = options.get('latency', {})
+        for key in ('value', 'low', 'high', 'median'):
+            if key in latency:
+                latency[key] *= scale
+    return simulator
+
+
+def main(total, scale):
+    category = Category.objects.create(name='Bench', description='Benchmark category')
+    message = GilaMessage.objects.create(message='Hello {user_name}, news about {category}', category=category)
+    users = []
+    for index in range(total):
+        user = User(index, "user{}".format(index), "user{}@mail.com".format(index), 454545, [category])
+        sms_channel = SMSChannel(index, ChannelType.SMS, "description")
+        sms_channel.set_phone_number(user.phone_number)
+        email_channel = EmailChannel(index, ChannelType.EMAIL, "description")
+        email_channel.set_email(user.email)
+        user.add_channel(sms_channel)
+        user.add_channel(email_channel)
+        users.append(user)
+
+    with override_settings(NOTIFICATION_PROVIDER_BACKEND='simulator',
+                           NOTIFICATION_PROVIDER_SIMULATOR=scaled_simulator(scale)):
+        statuses = Counter()
+        start = time.perf_counter()
+        for user in users:
+            statuses.update(user.send_notifications(message))
+        elapsed = time.perf_counter() - start
+
+    deliveries = sum(statuses.values())
+    print("Users: {}, deliveries: {}, latency scale: {}".format(total, deliveries, scale))
+    print("Elapsed: {:.2f} s, throughput: {:.1f} deliveries/s".format(elapsed, deliveries / elapsed))
+    print("Outcomes: {}".format(dict(statuses)))
+
+
+if __name__ == '__main__':
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 100, float(sys.argv[2]) if len(sys.argv) > 2 else 1.0)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
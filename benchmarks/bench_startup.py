@@ -0,0 +1,47 @@
+"""
+Benchmark for worker startup.
+
+Starts fresh interpreters that only run django.setup(), the same work a gunicorn worker or a
+manage.py command does before serving, and reports the wall time and the number of SQL
+queries executed while the apps were loading.
+
+Usage:
+    $ python benchmarks/bench_startup.py [number_of_runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import os
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notification_service_backend.settings")
+from django.db import connections
+queries = []
+import django
+from django.conf import settings
+for alias in settings.DATABASES:
+    connections[alias].execute_wrappers.append(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args))
+django.setup()
+print(len(queries))
+"""
+
+
+def main(runs):
+    timings = []
+    queries = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, capture_output=True, text=True, check=True)
+        timings.append(time.perf_counter() - start)
+        queries = int(result.stdout.strip().splitlines()[-1])
+    print("Runs: {}".format(runs))
+    print("Startup median: {:.1f} ms, best: {:.1f} ms".format(statistics.median(timings) * 1000, min(timings) * 1000))
+    print("Queries during django.setup(): {}".format(queries))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
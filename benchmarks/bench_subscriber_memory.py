@@ -0,0 +1,90 @@
+"""
+Benchmark for the memory used by in-memory subscribers.
+
+Builds the same population of users with one SMS channel each, subscribed to three
+categories, twice: with dict-backed classes holding Category instances (the previous
+representation) and with the __slots__ classes from auxiliar_models holding category ids.
+
+Usage:
+    $ python benchmarks/bench_subscriber_memory.py [number_of_users]
+"""
+import os
+import sys
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notification_service_backend.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from notifications.models import Category  # noqa: E402
+from notifications.utilities.auxiliar_models import User, SMSChannel, ChannelType  # noqa: E402
+
+
+class DictUser:
+    def __init__(self, identifier, name, email, phone_number, categories):
+        self.identifier = identifier
+        self.name = name
+        self.email = email
+        self.phone_number = phone_number
+        self.subscribed_categories = list(categories)
+        self.channels = []
+
+
+class DictSMSChannel:
+    def __init__(self, identifier, channel_type, description):
+        self.identifier = identifier
+        self.channel_type = channel_type
+        self.description = description
+        self.phone_number = None
+
+
+def measure(build, total):
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    users = build(total)
+    used = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(start, 'filename'))
+    tracemalloc.stop()
+    del users
+    return used / total
+
+
+def build_dict_users(total, categories):
+    users = []
+    for index in range(total):
+        user = DictUser(index, "user", "user@mail.com", 454545, categories)
+        channel = DictSMSChannel(index, ChannelType.SMS, "description")
+        channel.phone_number = user.phone_number
+        user.channels.append(channel)
+        users.append(user)
+    return users
+
+
+def build_slots_users(total, category_ids):
+    users = []
+    for index in range(total):
+        user = User(index, "user", "user@mail.com", 454545, category_ids)
+        channel = SMSChannel(index, ChannelType.SMS, "description")
+        channel.set_phone_number(user.phone_number)
+        user.add_channel(channel)
+        users.append(user)
+    return users
+
+
+def main(total):
+    categories = [Category(id=uuid.uuid4(), name='category', description='description') for _ in range(3)]
+    category_ids = [category.id for category in categories]
+
+    before = measure(lambda count: build_dict_users(count, categories), total)
+    after = measure(lambda count: build_slots_users(count, category_ids), total)
+    print("Subscribers: {}".format(total))
+    print("{:<40} {:>8.0f} bytes/subscriber".format("dict-backed, Category instances", before))
+    print("{:<40} {:>8.0f} bytes/subscriber".format("__slots__, category ids", after))
+    print("Reduction: {:.1f}x".format(before / after))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
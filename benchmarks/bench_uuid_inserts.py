@@ -0,0 +1,53 @@
+"""
+Benchmark for inserting rows keyed by random (v4) and time-ordered (v7) UUIDs.
+
+Inserts the same number of rows into two SQLite tables with a UUID primary key, the way
+LogHistory is written during fan-out, and reports throughput and the size and fill factor of the
+primary key index afterwards (requires SQLite built with the dbstat table).
+
+Usage:
+    $ python benchmarks/bench_uuid_inserts.py [number_of_rows]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notifications.utilities.identifiers import uuid7  # noqa: E402
+
+BATCH_SIZE = 1000
+
+
+def run(label, generate, total, directory):
+    path = os.path.join(directory, '{}.sqlite3'.format(label))
+    connection = sqlite3.connect(path)
+    # A small page cache makes page splits and random index writes show up as they would on a large table.
+    connection.execute('PRAGMA cache_size = -2000')
+    connection.execute('CREATE TABLE log (id BLOB PRIMARY KEY, user TEXT, channel_type TEXT)')
+    start = time.perf_counter()
+    for offset in range(0, total, BATCH_SIZE):
+        rows = [(generate().bytes, 'user', 'SMS') for _ in range(min(BATCH_SIZE, total - offset))]
+        with connection:
+            connection.executemany('INSERT INTO log VALUES (?, ?, ?)', rows)
+    elapsed = time.perf_counter() - start
+    pages, size, unused = connection.execute(
+        "SELECT count(*), sum(pgsize), sum(unused) FROM dbstat WHERE name = 'sqlite_autoindex_log_1'"
+    ).fetchone()
+    connection.close()
+    print("{:<4} {:>10.0f} rows/s   index {:>7} pages {:>7.1f} MB   {:>5.1f}% full".format(
+        label, total / elapsed, pages, size / 2 ** 20, (size - unused) / size * 100))
+
+
+def main(total):
+    print("Inserting {} rows per table".format(total))
+    with tempfile.TemporaryDirectory() as directory:
+        run('v4', uuid.uuid4, total, directory)
+        run('v7', uuid7, total, directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -2,6 +2,7 @@
 ASGI config for notification_service_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests to the live delivery feed are served by ``LiveFeedApp``; everything else goes to Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
@@ -13,4 +14,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notification_service_backend.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from notifications.utilities.live_feed import LiveFeedApp  # noqa: E402
+
+application = LiveFeedApp(django_application)
@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "notifications.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -60,6 +61,8 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "notifications.middleware.ReplicaRoutingMiddleware",
+    "notifications.middleware.ProfilingMiddleware",
 ]
 ROOT_URLCONF = "notification_service_backend.urls"
 
@@ -92,8 +95,116 @@ DATABASES = {
         'PASSWORD': "admin",
         'HOST': "localhost",
         'PORT': 5432,
+    },
+    # Read replica used for the reporting paths below. Add it to enable replica routing, e.g.:
+    # 'replica': {
+    #     'ENGINE': 'django.db.backends.postgresql_psycopg2',
+    #     'NAME': "notification_service_gila",
+    #     'USER': "postgres",
+    #     'PASSWORD': "admin",
+    #     'HOST': "replica.localhost",
+    #     'PORT': 5432,
+    # },
+}
+
+DATABASE_ROUTERS = ["notifications.utilities.db_router.ReadReplicaRouter"]
+
+# Safe requests on these paths read from the replica. After a write, a client reads from the default
+# database for REPLICA_STICKY_SECONDS so it sees its own changes.
+REPLICA_DATABASE_ALIAS = "replica"
+REPLICA_READ_PATHS = [
+    "/notification-service/messages/",
+    "/notification-service/log-history/",
+    "/notification-service/stats/",
+    "/notification-service/search/",
+    "/admin/notifications/loghistory/",
+]
+REPLICA_STICKY_SECONDS = 5
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    # orjson is used when installed (`pip install orjson`); otherwise these fall back to the stdlib JSON backend.
+    "DEFAULT_RENDERER_CLASSES": [
+        "notifications.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "notifications.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Response compression for API payloads. Brotli is used when the `brotli` package is installed, gzip otherwise.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CONTENT_TYPES = ["application/json"]
+COMPRESSION_BROTLI_QUALITY = 4
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# The list endpoints cache their responses here. The local-memory cache is per process, so use a
+# shared backend (Redis, Memcached) when running several workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+
+NOTIFICATIONS_RESPONSE_CACHE_TIMEOUT = 300
+
+# Seconds an Idempotency-Key is remembered. Expired keys are deleted by `manage.py purge_idempotency_keys`.
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+# Seconds after which a key whose request died before creating its message (e.g. the process was killed) is considered
+# abandoned and can be reused. Keys with a created message are never taken over.
+IDEMPOTENCY_KEY_LEASE = 60
+
+# Live delivery feed (ASGI only): events buffered per subscriber before it is dropped, and seconds between keepalives.
+LIVE_FEED_BUFFER_SIZE = 1000
+LIVE_FEED_KEEPALIVE = 15
+
+# Notification providers. "console" prints every notification; "simulator" stands in for real providers with the
+# latency distribution, error rate and rate limit (sends per second) configured per ChannelType name below.
+NOTIFICATION_PROVIDER_BACKEND = "console"
+NOTIFICATION_PROVIDER_SEED = None
+NOTIFICATION_PROVIDER_SIMULATOR = {
+    "SMS": {
+        "latency": {"distribution": "lognormal", "median": 0.2, "sigma": 0.5},
+        "error_rate": 0.02,
+        "rate_limit": 50,
+    },
+    "EMAIL": {
+        "latency": {"distribution": "lognormal", "median": 0.1, "sigma": 0.7},
+        "error_rate": 0.01,
+        "rate_limit": 100,
+    },
+    "PUSH_NOTIFICATION": {
+        "latency": {"distribution": "uniform", "low": 0.01, "high": 0.05},
+        "error_rate": 0.005,
+        "rate_limit": 500,
+    },
+}
+
+# Seconds after which the scheduler retries a message whose fan-out failed.
+SCHEDULER_RETRY_DELAY = 60
+
+# Fan-out planning: messages reaching at most NOTIFICATION_INLINE_MAX_RECIPIENTS users are sent inline; larger
+# broadcasts are split into shards of NOTIFICATION_SHARD_SIZE users sent by NOTIFICATION_DISPATCH_WORKERS threads.
+NOTIFICATION_INLINE_MAX_RECIPIENTS = 100
+NOTIFICATION_SHARD_SIZE = 500
+NOTIFICATION_DISPATCH_WORKERS = 4
+
+# On-demand request profiling. When enabled, requests sending the PROFILING_HEADER header with the PROFILING_TOKEN
+# value, plus a PROFILING_SAMPLE_RATE fraction of all requests, are profiled into PROFILING_DIR.
+PROFILING_ENABLED = False
+PROFILING_HEADER = "X-Profile"
+PROFILING_TOKEN = None
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_DIR = BASE_DIR / "profiles"
+PROFILING_MAX_FILES = 100
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
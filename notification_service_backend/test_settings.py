@@ -0,0 +1,23 @@
+"""
+Settings for running the test suite without a PostgreSQL server.
+
+Both the default database and the read replica are SQLite databases, so replica routing is
+tested against two real databases. The test databases are files rather than in-memory
+databases, so the threads of a sharded fan-out can write to them concurrently:
+
+    python manage.py test --settings=notification_service_backend.test_settings
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "default.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_default.sqlite3"},
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "replica.sqlite3",
+        "TEST": {"NAME": BASE_DIR / "test_replica.sqlite3"},
+    },
+}
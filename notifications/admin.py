@@ -1,18 +1,39 @@
 from django.contrib import admin
 
 from .models import Category, GilaMessage, LogHistory
+from .utilities.purge import soft_delete
+
+
+class SoftDeleteAdminMixin:
+    """
+    Admin mixin that soft-deletes objects instead of deleting them with their dependents.
+
+    Deleted objects disappear at once and are removed later by `manage.py purge_deleted`, as
+    with the API. The confirmation page lists only the selected objects, so it doesn't collect
+    the cascade either.
+    """
+
+    def delete_model(self, request, obj):
+        soft_delete(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            soft_delete(obj)
+
+    def get_deleted_objects(self, objs, request):
+        return [str(obj) for obj in objs], {self.model._meta.verbose_name_plural: len(objs)}, set(), []
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'description')
 
 
 @admin.register(GilaMessage)
-class GilaMessageAdmin(admin.ModelAdmin):
+class GilaMessageAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     list_display = ('message', 'category')
 
 
 @admin.register(LogHistory)
 class LogHistoryAdmin(admin.ModelAdmin):
-    list_display = ('id', 'time', 'user', "message")
\ No newline at end of file
+    list_display = ('id', 'time', 'user', "message")
@@ -6,5 +6,6 @@ class NotificationsConfig(AppConfig):
     name = 'notifications'
 
     def ready(self):
-        from notifications.utilities import signals
-        signals.load_initial_data()
+        # Only register the signal receivers: the app must not touch the database at startup.
+        # Predefined categories are seeded after `migrate` or with `manage.py seed_categories`.
+        from notifications.utilities import signals  # noqa: F401
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from notifications.utilities.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = ("Rebuild the delivery rollups served by /stats/ from the LogHistory table, for every day before today. "
+            "Today's rollups keep being updated as deliveries are logged.")
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write("Rebuilt {} delivery rollup rows.".format(count))
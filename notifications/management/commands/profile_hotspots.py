@@ -0,0 +1,29 @@
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.utilities.profiling import get_profile_dir, summarize_queries
+
+
+class Command(BaseCommand):
+    help = "Summarize the hottest functions and SQL statements across the captured request profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20,
+                            help="Number of functions and statements to show.")
+        parser.add_argument('--sort', default='cumulative', choices=['cumulative', 'tottime', 'ncalls'],
+                            help="Order of the function listing.")
+
+    def handle(self, *args, **options):
+        directory = get_profile_dir()
+        profiles = sorted(str(path) for path in directory.glob('*.prof'))
+        if not profiles:
+            raise CommandError("No profiles found in {}.".format(directory))
+
+        self.stdout.write("{} profiles in {}".format(len(profiles), directory))
+        stats = pstats.Stats(*profiles, stream=self.stdout)
+        stats.strip_dirs().sort_stats(options['sort']).print_stats(options['limit'])
+
+        self.stdout.write("Slowest SQL statements (total time across profiles):")
+        for sql, count, duration in summarize_queries(directory, options['limit']):
+            self.stdout.write("{:>10.2f} ms {:>6}x  {}".format(duration * 1000, count, sql[:200]))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from notifications.utilities.purge import purge_deleted
+
+
+class Command(BaseCommand):
+    help = "Permanently remove deleted categories and messages, with their log entries, in small chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Number of rows deleted per statement.")
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help="Seconds to sleep between chunks.")
+
+    def handle(self, *args, **options):
+        def progress(stage, deleted):
+            self.stdout.write("{}: {} rows deleted".format(stage, deleted))
+
+        totals = purge_deleted(chunk_size=options['chunk_size'], pause=options['pause'], progress=progress)
+        self.stdout.write("Purge finished: {}".format(
+            ", ".join("{} {}".format(count, stage) for stage, count in totals.items())
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notifications.utilities.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete the idempotency keys older than IDEMPOTENCY_KEY_TTL."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write("Deleted {} expired idempotency keys.".format(deleted))
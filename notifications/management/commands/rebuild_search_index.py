@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from notifications.utilities.search import ensure_search_index
+
+
+class Command(BaseCommand):
+    help = "Create the full-text index over messages, and on SQLite rebuild it from the messages."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help="The database to index.")
+
+    def handle(self, *args, **options):
+        ensure_search_index(options['database'])
+        self.stdout.write("Search index ready on '{}'.".format(options['database']))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import Case, Value, When
+
+from notifications.models import LogHistory
+from notifications.utilities.identifiers import uuid7
+
+
+class Command(BaseCommand):
+    help = ("Give log entries created before time-ordered ids were introduced a UUIDv7 id derived "
+            "from their time, so the primary key order matches the log order.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Number of entries read and updated per batch.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        updated = 0
+        last_id = None
+        # Walk the table once in primary key order, reading each batch from the index. Entries
+        # re-keyed earlier may be read again, but they are version 7 by then and skipped.
+        while True:
+            queryset = LogHistory.objects.order_by('id')
+            if last_id is not None:
+                queryset = queryset.filter(id__gt=last_id)
+            batch = list(queryset.values_list('id', 'time')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            new_ids = {old_id: uuid7(time) for old_id, time in batch if old_id.version == 4}
+            if new_ids:
+                self.rekey(new_ids)
+                updated += len(new_ids)
+                self.stdout.write("Re-keyed {} log entries.".format(updated))
+        self.stdout.write("Done, {} log entries re-keyed.".format(updated))
+
+    def rekey(self, new_ids):
+        """
+        Replace the ids of a batch of log entries with a single UPDATE.
+
+        Args:
+            new_ids (dict): The new id of each old id.
+        """
+        with transaction.atomic():
+            LogHistory.objects.filter(id__in=list(new_ids)).update(id=Case(
+                *[When(id=old_id, then=Value(new_id)) for old_id, new_id in new_ids.items()],
+                output_field=models.UUIDField(),
+            ))
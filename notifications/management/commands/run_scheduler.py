@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from notifications.utilities.scheduler import MessageScheduler
+
+
+class Command(BaseCommand):
+    help = "Run the worker that dispatches scheduled messages when they become due."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help="Number of due messages fetched per query.")
+        parser.add_argument('--max-idle', type=float, default=1.0,
+                            help="Maximum number of seconds to sleep between checks.")
+
+    def handle(self, *args, **options):
+        scheduler = MessageScheduler(batch_size=options['batch_size'], max_idle=options['max_idle'])
+        self.stdout.write("Scheduler started.")
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            scheduler.stop()
+        self.stdout.write("Scheduler stopped.")
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from notifications.utilities.local_data import seed_categories
+
+
+class Command(BaseCommand):
+    help = "Create the predefined categories that don't exist yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help="Database alias to seed.")
+
+    def handle(self, *args, **options):
+        count = seed_categories(using=options['database'])
+        self.stdout.write("Seeded {} predefined categories.".format(count))
@@ -0,0 +1,173 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from notifications.utilities.db_router import get_replica_alias, use_replica
+from notifications.utilities.profiling import RequestProfiler, should_profile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware that serves read-only requests on reporting paths from the read replica.
+
+    Safe requests whose path starts with one of REPLICA_READ_PATHS read from the replica.
+    After a successful write, the client gets a short-lived cookie that pins its reads to the
+    default database for REPLICA_STICKY_SECONDS, so it always sees its own writes even while
+    the replica is catching up.
+    """
+    pin_cookie = 'pin_primary'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if self.should_use_replica(request):
+            with use_replica():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400 and get_replica_alias():
+            response.set_cookie(self.pin_cookie, '1', max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 5),
+                                httponly=True, samesite='Lax')
+        return response
+
+    def should_use_replica(self, request):
+        """
+        Check whether a request can read from the replica.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            bool: True for safe requests on a reporting path from clients that have not written recently.
+        """
+        return (
+            request.method in SAFE_METHODS
+            and self.pin_cookie not in request.COOKIES
+            and get_replica_alias() is not None
+            and request.path.startswith(tuple(getattr(settings, 'REPLICA_READ_PATHS', ())))
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Middleware that profiles selected requests with cProfile, including the SQL they run.
+
+    It is only active when PROFILING_ENABLED is set. A request is profiled when it carries the
+    PROFILING_HEADER header with the PROFILING_TOKEN value, or when it is sampled with
+    PROFILING_SAMPLE_RATE. Each profile is written to PROFILING_DIR, which keeps the latest
+    PROFILING_MAX_FILES profiles; summarize them with `manage.py profile_hotspots`.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request):
+            return self.get_response(request)
+        with RequestProfiler(request) as profiler:
+            response = self.get_response(request)
+        profiler.save(response.status_code)
+        response['X-Profile-Id'] = profiler.profile_id
+        return response
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header.
+
+    Args:
+        header (str): The header value, e.g. 'gzip, br;q=0.9'.
+
+    Returns:
+        dict: The accepted codings and their quality values.
+    """
+    codings = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            codings[coding.strip().lower()] = quality
+    return codings
+
+
+class CompressionMiddleware:
+    """
+    Middleware that compresses API responses with brotli or gzip, as negotiated by the client.
+
+    Only responses whose content type is in COMPRESSION_CONTENT_TYPES and whose body is at least
+    COMPRESSION_MIN_SIZE bytes are compressed. HTML pages carrying CSRF tokens are left out to
+    avoid BREACH-style attacks. Brotli is used when the brotli package is installed and the
+    client accepts it; otherwise gzip.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.content_types = tuple(getattr(settings, 'COMPRESSION_CONTENT_TYPES', ('application/json',)))
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 4)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming or response.has_header('Content-Encoding')
+                or not response.get('Content-Type', '').startswith(self.content_types)):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding = self.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding == 'br':
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        elif encoding == 'gzip':
+            compressed = compress_string(response.content)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def choose_encoding(header):
+        """
+        Pick the response encoding for an Accept-Encoding header.
+
+        Args:
+            header (str): The Accept-Encoding header.
+
+        Returns:
+            str or None: 'br', 'gzip' or None for an uncompressed response.
+        """
+        codings = parse_accept_encoding(header)
+        wildcard = codings.get('*', 0.0)
+        brotli_quality = codings.get('br', wildcard) if brotli is not None else 0.0
+        gzip_quality = codings.get('gzip', wildcard)
+        if brotli_quality > 0 and brotli_quality >= gzip_quality:
+            return 'br'
+        if gzip_quality > 0:
+            return 'gzip'
+        return None
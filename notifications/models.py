@@ -1,7 +1,27 @@
-import uuid
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 
+from notifications.utilities.identifiers import uuid7
+
+
+class ActiveCategoryManager(models.Manager):
+    """
+    Manager that hides soft-deleted categories.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ActiveMessageManager(models.Manager):
+    """
+    Manager that hides soft-deleted messages and the messages of soft-deleted categories.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True, category__deleted_at__isnull=True)
+
 
 class Category(models.Model):
     """
@@ -10,13 +30,19 @@ class Category(models.Model):
     The Category model defines a category that can be used to group related messages.
 
     Attributes:
-        id (UUIDField): The unique identifier for the category.
+        id (UUIDField): The unique identifier for the category, time-ordered (UUIDv7).
         name (CharField): The name of the category, limited to 30 characters.
         description (CharField): A brief description of the category, limited to 30 characters.
+        deleted_at (DateTimeField): When the category was deleted. Deleted categories and their messages are
+            hidden by `objects` and removed later in chunks by `manage.py purge_deleted`.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=30)
     description = models.CharField(max_length=50)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+
+    objects = ActiveCategoryManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.name
@@ -29,17 +55,51 @@ class GilaMessage(models.Model):
     The GilaMessage model defines a message that is associated with a specific category.
 
     Attributes:
-        id (UUIDField): The unique identifier for the gilaMessage.
+        id (UUIDField): The unique identifier for the gilaMessage, time-ordered (UUIDv7).
         message (TextField): The content of the message, allowing unlimited characters.
         category (ForeignKey): A foreign key to the Category model, representing the associated category.
+        send_at (DateTimeField): When the message should be delivered. Empty means deliver immediately.
+        sent_at (DateTimeField): When the message was dispatched to subscribers. Empty while still pending.
+        deleted_at (DateTimeField): When the message was deleted. Deleted messages are hidden by `objects`
+            and removed later in chunks by `manage.py purge_deleted`.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     message = models.TextField()
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    send_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+
+    objects = ActiveMessageManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Only pending scheduled messages are indexed, so the scheduler's "next due" lookup stays
+            # small no matter how many messages have already been delivered.
+            models.Index(
+                fields=['send_at'],
+                name='gilamessage_pending_send_at',
+                condition=models.Q(sent_at__isnull=True, send_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return self.message
 
+    def is_due(self, now=None):
+        """
+        Check whether the message should be dispatched now.
+
+        Args:
+            now (datetime): The reference time. Defaults to the current time.
+
+        Returns:
+            bool: True if the message is not scheduled for a future time.
+        """
+        now = now or timezone.now()
+        return self.send_at is None or self.send_at <= now
+
 
 class LogHistory(models.Model):
     """
@@ -48,17 +108,36 @@ class LogHistory(models.Model):
     The LogHistory model represents a log entry with information about the user, channel, and message.
 
     Attributes:
-        id (UUIDField): The unique identifier for the log history entry.
+        id (UUIDField): The unique identifier for the log history entry, time-ordered (UUIDv7) so
+            inserts append to the primary key index and the log can be paged by primary key.
         time (DateTimeField): The date and time when the log entry was created. Default value is the current date and time.
         user (ForeignKey): A foreign key to the User model, representing the user associated with the log entry.
         channel (ForeignKey): A foreign key to the Channel model, representing the channel associated with the log entry.
         message (TextField): The content of the log entry, allowing unlimited characters.
+        status (CharField): The outcome of the delivery: sent, failed or rate_limited.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     time = models.DateTimeField(default=timezone.now)
+    SENT = 'sent'
+    FAILED = 'failed'
+    RATE_LIMITED = 'rate_limited'
+    STATUS_CHOICES = [
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+        (RATE_LIMITED, 'Rate limited'),
+    ]
+
     user = models.CharField(max_length=50)
     channel_type = models.CharField(max_length=50)
     message = models.ForeignKey(GilaMessage, on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=SENT)
+
+    class Meta:
+        indexes = [
+            # Lists the deliveries of a message in id order, so search results can show the first
+            # few recipients of a broadcast without reading all of its log entries.
+            models.Index(fields=['message', 'status', 'id'], name='loghistory_message_status_id'),
+        ]
 
     def __str__(self):
         return "Log ID: {id}, Time: {time}, User: {user}".format(
@@ -67,3 +146,64 @@ class LogHistory(models.Model):
             user=self.user,
             channel_type=self.channel_type
         )
+
+
+class IdempotencyKey(models.Model):
+    """
+    Represents a client-supplied Idempotency-Key for message creation.
+
+    The first request with a key reserves it; the response is stored once the request finishes,
+    so retries with the same key get the original response back instead of creating and
+    fanning out a new message.
+
+    Attributes:
+        key (CharField): The value of the Idempotency-Key header, unique.
+        created_at (DateTimeField): When the key was first used. Keys expire after IDEMPOTENCY_KEY_TTL seconds.
+        response_status (PositiveSmallIntegerField): The HTTP status of the original response. Empty while in progress.
+        response_body (JSONField): The body of the original response.
+        request_hash (CharField): The SHA-256 of the original request body, to detect a key reused
+            for a different request.
+        created_message (UUIDField): The id of the message created by the original request, stored
+            with the message itself. Not a foreign key, so purging messages is not held up by old keys.
+    """
+    key = models.CharField(max_length=255, unique=True)
+    request_hash = models.CharField(max_length=64, blank=True, default='')
+    created_message = models.UUIDField(null=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    response_status = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+
+    def __str__(self):
+        return self.key
+
+
+class DeliveryRollup(models.Model):
+    """
+    Represents the number of deliveries per day, category and channel type.
+
+    Rows are incremented as LogHistory entries are written, so dashboards read a handful of
+    pre-aggregated rows instead of aggregating over the whole log.
+
+    Attributes:
+        day (DateField): The day of the deliveries.
+        category (ForeignKey): A foreign key to the Category model of the delivered messages.
+        channel_type (CharField): The channel the deliveries were made on.
+        count (PositiveBigIntegerField): The number of deliveries.
+    """
+    day = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    channel_type = models.CharField(max_length=50)
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category', 'channel_type'], name='deliveryrollup_unique_bucket'),
+        ]
+
+    def __str__(self):
+        return "{day} {category} {channel_type}: {count}".format(
+            day=self.day,
+            category=self.category_id,
+            channel_type=self.channel_type,
+            count=self.count
+        )
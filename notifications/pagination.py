@@ -0,0 +1,34 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class MessagePagination(PageNumberPagination):
+    """
+    Page number pagination for the message list.
+
+    Attributes:
+        page_size (int): The default number of messages per page.
+        page_size_query_param (str): The query parameter clients can use to change the page size.
+        max_page_size (int): The largest page size a client can request.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class LogHistoryPagination(CursorPagination):
+    """
+    Cursor pagination for the delivery log, newest entries first.
+
+    LogHistory ids are time-ordered, so the cursor walks the primary key index directly
+    instead of counting or offsetting over the whole table.
+
+    Attributes:
+        page_size (int): The default number of entries per page.
+        page_size_query_param (str): The query parameter clients can use to change the page size.
+        max_page_size (int): The largest page size a client can request.
+        ordering (str): The primary key, descending.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = '-id'
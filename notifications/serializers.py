@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import Category, GilaMessage, LogHistory
+from .models import Category, GilaMessage, LogHistory, DeliveryRollup
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -14,13 +14,13 @@ class CategorySerializer(serializers.ModelSerializer):
     Attributes:
         Meta: A nested class that defines the serializer's behavior and configuration.
             model (Category): The Django model associated with the serializer.
-            fields (list or '__all__'): The fields to include in the serialized representation
-                of Category objects. If '__all__' is used, all fields of the model will be included.
+            exclude (list): The fields left out of the serialized representation of Category objects.
+                Every other field of the model is included; deleted_at is internal to soft deletion.
     """
 
     class Meta:
         model = Category
-        fields = '__all__'
+        exclude = ['deleted_at']
 
 
 class MessageSerializer(serializers.ModelSerializer):
@@ -34,13 +34,13 @@ class MessageSerializer(serializers.ModelSerializer):
     Attributes:
         Meta: A nested class that defines the serializer's behavior and configuration.
             model (Message): The Django model associated with the serializer.
-            fields (list or '__all__'): The fields to include in the serialized representation
-                of Message objects. If '__all__' is used, all fields of the model will be included.
+            exclude (list): The fields left out of the serialized representation of Message objects.
+                Every other field of the model is included; deleted_at is internal to soft deletion.
     """
 
     class Meta:
         model = GilaMessage
-        fields = '__all__'
+        exclude = ['deleted_at']
 
 
 class LogHistorySerializer(serializers.ModelSerializer):
@@ -65,3 +65,106 @@ class LogHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = LogHistory
         fields = '__all__'
+
+
+class DeliveryRollupSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the DeliveryRollup model.
+
+    The DeliveryRollupSerializer is used to convert DeliveryRollup model instances to JSON
+    representation for the /stats/ endpoint.
+
+    Attributes:
+        Meta: A nested class that defines the serializer's behavior and configuration.
+            model (DeliveryRollup): The Django model associated with the serializer.
+            fields (list): The fields to include in the serialized representation.
+    """
+
+    class Meta:
+        model = DeliveryRollup
+        fields = ['day', 'category', 'channel_type', 'count']
+
+
+class MessageSearchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for message search results.
+
+    Attributes:
+        rank (FloatField): The relevance of the message for the search, higher is better.
+        recipients (SerializerMethodField): The first users the message was delivered to, with the channel used.
+        recipient_count (SerializerMethodField): The number of deliveries of the message.
+            Both are read from the 'recipients' context entry, a dict of message id to (recipients, count),
+            see notifications.utilities.search.load_recipients.
+
+        Meta: A nested class that defines the serializer's behavior and configuration.
+            model (GilaMessage): The Django model associated with the serializer.
+            fields (list): The fields to include in the serialized representation.
+    """
+    rank = serializers.FloatField(read_only=True)
+    recipients = serializers.SerializerMethodField()
+    recipient_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GilaMessage
+        fields = ['id', 'message', 'category', 'sent_at', 'rank', 'recipients', 'recipient_count']
+
+    def get_recipients(self, message):
+        return self.context.get('recipients', {}).get(message.id, ([], 0))[0]
+
+    def get_recipient_count(self, message):
+        return self.context.get('recipients', {}).get(message.id, ([], 0))[1]
+
+
+class ValuesSerializer:
+    """
+    Lightweight read-only serializer for rows produced by QuerySet.values().
+
+    ModelSerializer builds a field instance per column and runs it for every row. List
+    endpoints only need to rename a few keys, so this serializer works on plain dictionaries
+    and leaves UUID and datetime formatting to the JSON renderer.
+
+    Attributes:
+        fields (tuple): The model fields selected with QuerySet.values().
+        renamed_fields (dict): Maps selected field names to the keys used in the response,
+            e.g. 'category_id' to 'category', so the output matches the ModelSerializer.
+    """
+    fields = ()
+    renamed_fields = {}
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def values(cls, queryset):
+        """
+        Select the serializer fields from a queryset.
+
+        Args:
+            queryset (QuerySet): The queryset to read from.
+
+        Returns:
+            QuerySet: A values() queryset with only the serializer fields.
+        """
+        return queryset.values(*cls.fields)
+
+    @property
+    def data(self):
+        renamed_fields = self.renamed_fields
+        if not renamed_fields:
+            return list(self.rows)
+        return [{renamed_fields.get(key, key): value for key, value in row.items()} for row in self.rows]
+
+
+class CategoryReadSerializer(ValuesSerializer):
+    """
+    Read-only serializer for listing Category objects.
+    """
+    fields = ('id', 'name', 'description')
+
+
+class MessageReadSerializer(ValuesSerializer):
+    """
+    Read-only serializer for listing GilaMessage objects.
+    """
+    fields = ('id', 'message', 'category_id', 'send_at', 'sent_at')
+    renamed_fields = {'category_id': 'category'}
@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from notifications.models import Category
+from notifications.utilities.auxiliar_models import User, SMSChannel, EmailChannel, ChannelType
+
+
+class UserTestCase(TestCase):
+    def setUp(self):
+        self.sport = Category.objects.create(name='Sport', description='Test Description')
+        self.finance = Category.objects.create(name='Finance', description='Test Description')
+
+    def test_user_keeps_category_ids(self):
+        user = User(1, "Josh", "josh@mal.com", 454545, [self.sport])
+        self.assertEqual(user.subscribed_categories, (self.sport.id,))
+        self.assertTrue(user.is_subscribed(self.sport))
+        self.assertTrue(user.is_subscribed(str(self.sport.id)))
+        self.assertFalse(user.is_subscribed(self.finance))
+
+    def test_subscribe_category(self):
+        user = User(1, "Josh", "josh@mal.com", 454545)
+        user.subscribe_category(self.finance)
+        user.subscribe_category(self.finance.id)
+        self.assertEqual(user.subscribed_categories, (self.finance.id,))
+
+    def test_users_share_subscription_tuples(self):
+        josh = User(1, "Josh", "josh@mal.com", 454545, [self.sport, self.finance])
+        dan = User(2, "Dan", "dan@mal.com", 454545, [self.sport.id, self.finance.id])
+        self.assertIs(josh.subscribed_categories, dan.subscribed_categories)
+
+    def test_users_and_channels_have_no_instance_dict(self):
+        user = User(1, "Josh", "josh@mal.com", 454545)
+        user.add_channel(SMSChannel(1, ChannelType.SMS, "description"))
+        user.add_channel(EmailChannel(2, ChannelType.EMAIL, "description"))
+        self.assertEqual(len(user.channels), 2)
+        for item in (user,) + user.channels:
+            self.assertFalse(hasattr(item, '__dict__'))
@@ -0,0 +1,97 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from notifications.middleware import ReplicaRoutingMiddleware
+from notifications.models import Category, GilaMessage, LogHistory
+from notifications.utilities.db_router import ReadReplicaRouter, use_replica
+
+
+@skipUnless('replica' in settings.DATABASES,
+            "Needs a 'replica' database, run with --settings=notification_service_backend.test_settings")
+@override_settings(REPLICA_DATABASE_ALIAS='replica')
+class ReplicaRoutingTestCase(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReadReplicaRouter()
+        # Nothing replicates between the two test databases, which stands in for a replica that
+        # has not caught up: rows only written to one of them show where a read was served from.
+        self.category = Category.objects.create(name='Test Category', description='Test Description')
+        self.message = GilaMessage.objects.create(message='Primary Message', category=self.category)
+        Category.objects.using('replica').create(id=self.category.id, name='Test Category',
+                                                 description='Test Description')
+        self.replica_message = GilaMessage.objects.using('replica').create(message='Replica Message',
+                                                                           category_id=self.category.id)
+
+    def route(self, request):
+        routed = {}
+
+        def get_response(request):
+            routed['read'] = self.router.db_for_read(GilaMessage)
+            routed['write'] = self.router.db_for_write(GilaMessage)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(get_response)(request)
+        return routed, response
+
+    def message_ids(self, response):
+        return [message['id'] for message in response.json()['results']]
+
+    def test_router_uses_replica_only_when_opted_in(self):
+        self.assertIsNone(self.router.db_for_read(GilaMessage))
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(GilaMessage), 'replica')
+            self.assertIsNone(self.router.db_for_write(GilaMessage))
+            self.assertIsNone(self.router.db_for_read(Session))
+            self.assertIsNone(self.router.db_for_read(get_user_model()))
+
+    def test_reporting_reads_go_to_replica(self):
+        LogHistory.objects.using('replica').create(user='Josh', channel_type='SMS', message=self.replica_message,
+                                                   time=timezone.now())
+        response = self.client.get(reverse('log-history-list'))
+        self.assertEqual([entry['message']['id'] for entry in response.json()['results']],
+                         [str(self.replica_message.id)])
+
+        response = self.client.get(reverse('message-list-create'))
+        self.assertEqual(self.message_ids(response), [str(self.replica_message.id)])
+
+    def test_other_paths_read_default(self):
+        response = self.client.get(reverse('category-retrieve-update-delete', kwargs={'pk': self.category.id}))
+        self.assertEqual(response.status_code, 200)
+        routed, _ = self.route(self.factory.get('/notification-service/categories/'))
+        self.assertIsNone(routed['read'])
+
+    def test_write_then_pinned_read_sees_the_write(self):
+        response = self.client.post(reverse('message-list-create'),
+                                    {'message': 'New Message', 'category': self.category.id},
+                                    content_type='application/json')
+        self.assertIn('pin_primary', response.cookies)
+        created = response.json()['id']
+
+        # A client that has not written reads from the lagging replica, and its response is cached.
+        unpinned = self.client_class()
+        self.assertNotIn(created, self.message_ids(unpinned.get(reverse('message-list-create'))))
+
+        # The writer's reads are pinned to the default database and never served that cached response.
+        self.assertIn(created, self.message_ids(self.client.get(reverse('message-list-create'))))
+
+    def test_pin_cookie_reads_default(self):
+        self.client.cookies['pin_primary'] = '1'
+        response = self.client.get(reverse('message-list-create'))
+        self.assertEqual(self.message_ids(response), [str(self.message.id)])
+
+    @override_settings(REPLICA_DATABASE_ALIAS='missing')
+    def test_no_replica_configured(self):
+        routed, response = self.route(self.factory.get('/notification-service/log-history/'))
+        self.assertIsNone(routed['read'])
+        self.assertNotIn('pin_primary', response.cookies)
+        with use_replica():
+            self.assertIsNone(self.router.db_for_read(GilaMessage))
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, RequestFactory
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import Category, GilaMessage, IdempotencyKey
+from ..utilities.idempotency import purge_expired
+from ..views import MessageListCreateView
+
+
+class IdempotencyKeyTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.category = Category.objects.create(name='Test Category', description='Test Description')
+        self.view = MessageListCreateView.as_view()
+
+    def post(self, key, message='New Message'):
+        data = {'message': message, 'category': self.category.id}
+        request = self.factory.post('/messages/', data, content_type='application/json', HTTP_IDEMPOTENCY_KEY=key)
+        return self.view(request)
+
+    def test_retry_returns_original_response_without_new_fan_out(self):
+        with mock.patch('notifications.views.dispatch_message') as dispatch:
+            first = self.post('retry-key')
+            second = self.post('retry-key')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(GilaMessage.objects.count(), 1)
+        self.assertEqual(dispatch.call_count, 1)
+
+    def test_different_keys_create_different_messages(self):
+        with mock.patch('notifications.views.dispatch_message'):
+            self.post('key-1')
+            self.post('key-2')
+        self.assertEqual(GilaMessage.objects.count(), 2)
+
+    def test_in_progress_key_returns_conflict(self):
+        IdempotencyKey.objects.create(key='pending-key')
+        self.assertEqual(self.post('pending-key').status_code, status.HTTP_409_CONFLICT)
+
+    def test_abandoned_key_is_released_after_the_lease(self):
+        IdempotencyKey.objects.create(key='abandoned-key', created_at=timezone.now() - timedelta(minutes=5))
+        with mock.patch('notifications.views.dispatch_message'):
+            self.assertEqual(self.post('abandoned-key').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(GilaMessage.objects.count(), 1)
+
+    def test_key_reused_with_a_different_body(self):
+        with mock.patch('notifications.views.dispatch_message'):
+            self.post('reused-key')
+            response = self.post('reused-key', message='Another Message')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(GilaMessage.objects.count(), 1)
+
+    def test_lease_expiring_during_dispatch_does_not_duplicate(self):
+        retries = []
+
+        def slow_dispatch(message):
+            IdempotencyKey.objects.filter(key='slow-key').update(created_at=timezone.now() - timedelta(minutes=5))
+            retries.append(self.post('slow-key'))
+
+        with mock.patch('notifications.views.dispatch_message', side_effect=slow_dispatch) as dispatch:
+            first = self.post('slow-key')
+
+        self.assertEqual(retries[0].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retries[0].data['id'], first.data['id'])
+        self.assertEqual(retries[0]['Idempotent-Replayed'], 'true')
+        self.assertEqual(GilaMessage.objects.count(), 1)
+        self.assertEqual(dispatch.call_count, 1)
+
+    def test_failed_request_releases_key(self):
+        with mock.patch('notifications.serializers.MessageSerializer.save', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.post('failing-key')
+        self.assertFalse(IdempotencyKey.objects.filter(key='failing-key').exists())
+
+    def test_failure_after_creation_keeps_key(self):
+        with mock.patch('notifications.views.dispatch_message', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.post('failing-key')
+        with mock.patch('notifications.views.dispatch_message') as dispatch:
+            retry = self.post('failing-key')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(GilaMessage.objects.count(), 1)
+        dispatch.assert_not_called()
+
+    def test_purge_expired_keys(self):
+        IdempotencyKey.objects.create(key='old', created_at=timezone.now() - timedelta(days=2))
+        IdempotencyKey.objects.create(key='new')
+        self.assertEqual(purge_expired(), 1)
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['new'])
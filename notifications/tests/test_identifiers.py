@@ -0,0 +1,44 @@
+import uuid
+from io import StringIO
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from notifications.models import Category, GilaMessage, LogHistory
+from notifications.utilities.identifiers import uuid7
+
+
+class UUID7TestCase(TestCase):
+    def test_uuid7_version_and_variant(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_uuid7_is_monotonic(self):
+        values = [uuid7() for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+
+    def test_uuid7_from_timestamp(self):
+        now = timezone.now()
+        self.assertLess(uuid7(now - timedelta(seconds=1)), uuid7(now))
+
+    def test_models_use_uuid7(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        self.assertEqual(category.id.version, 7)
+
+    def test_rekey_log_history(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        message = GilaMessage.objects.create(message='Test Message', category=category)
+        now = timezone.now()
+        for minutes in (3, 1, 2):
+            LogHistory.objects.create(id=uuid.uuid4(), user='Josh', channel_type='SMS', message=message,
+                                      time=now - timedelta(minutes=minutes))
+
+        call_command('rekey_log_history', batch_size=2, stdout=StringIO())
+
+        entries = list(LogHistory.objects.order_by('id'))
+        self.assertTrue(all(entry.id.version == 7 for entry in entries))
+        self.assertEqual(entries, sorted(entries, key=lambda entry: entry.time))
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory
+from rest_framework import status
+
+from ..models import Category, GilaMessage
+from ..serializers import MessageSerializer, MessageReadSerializer
+from ..views import CategoryListCreateView, MessageListCreateView
+
+
+class MessageListTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.category = Category.objects.create(name='Test Category', description='Test Description')
+        for index in range(3):
+            GilaMessage.objects.create(message='Message {}'.format(index), category=self.category)
+
+    def test_read_serializer_matches_model_serializer_keys(self):
+        message = GilaMessage.objects.first()
+        rows = MessageReadSerializer.values(GilaMessage.objects.filter(pk=message.pk))
+        self.assertEqual(set(MessageReadSerializer(rows).data[0]), set(MessageSerializer(message).data))
+
+    def test_message_list_is_paginated(self):
+        request = self.factory.get('/messages/', {'page_size': 2})
+        response = MessageListCreateView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_message_list_is_cached_until_a_write(self):
+        view = MessageListCreateView.as_view()
+        view(self.factory.get('/messages/'))
+        with self.assertNumQueries(0):
+            response = view(self.factory.get('/messages/'))
+        self.assertEqual(response.data['count'], 3)
+
+        GilaMessage.objects.create(message='Another Message', category=self.category)
+        response = view(self.factory.get('/messages/'))
+        self.assertEqual(response.data['count'], 4)
+
+
+class CategoryListTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_category_list_is_invalidated_on_create(self):
+        view = CategoryListCreateView.as_view()
+        count = len(view(self.factory.get('/categories/')).data)
+        Category.objects.create(name='New Category', description='New Description')
+        self.assertEqual(len(view(self.factory.get('/categories/')).data), count + 1)
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from notifications.models import Category, GilaMessage, LogHistory
+from notifications.utilities.broadcaster import Broadcaster, DROPPED
+from notifications.utilities.live_feed import LiveFeedApp
+
+
+class BroadcasterTestCase(SimpleTestCase):
+    async def test_publish_from_another_thread(self):
+        broadcaster = Broadcaster()
+        subscription = broadcaster.subscribe()
+        thread = threading.Thread(target=broadcaster.publish, args=({'type': 'delivery', 'user': 'Josh'},))
+        thread.start()
+        thread.join()
+        event = await asyncio.wait_for(subscription.get(), 1)
+        self.assertEqual(event['user'], 'Josh')
+
+    async def test_filters(self):
+        broadcaster = Broadcaster()
+        subscription = broadcaster.subscribe({'category': 'sport'})
+        broadcaster.publish({'type': 'delivery', 'category': 'finance'})
+        broadcaster.publish({'type': 'delivery', 'category': 'sport'})
+        event = await asyncio.wait_for(subscription.get(), 1)
+        self.assertEqual(event['category'], 'sport')
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_slow_subscriber_is_dropped(self):
+        broadcaster = Broadcaster()
+        slow = broadcaster.subscribe(max_buffer=2)
+        for index in range(5):
+            broadcaster.publish({'type': 'delivery', 'index': index})
+        await asyncio.sleep(0)
+        self.assertTrue(slow.dropped)
+        self.assertIs(await slow.get(), DROPPED)
+        self.assertTrue(slow.queue.empty())
+
+
+class LiveFeedAppTestCase(SimpleTestCase):
+    async def test_streams_events_until_disconnect(self):
+        broadcaster = Broadcaster()
+        sent = []
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+            if message['type'] == 'http.response.start':
+                broadcaster.publish({'type': 'delivery', 'message': 'm1'})
+                broadcaster.publish({'type': 'delivery', 'message': 'm2'})
+            elif b'm1' in message.get('body', b''):
+                disconnect.set()
+
+        scope = {'type': 'http', 'path': '/live/', 'method': 'GET', 'query_string': b'message=m1'}
+        with mock.patch('notifications.utilities.live_feed.broadcaster', broadcaster):
+            await asyncio.wait_for(LiveFeedApp(None, path='/live/', keepalive=5)(scope, receive, send), 1)
+
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        bodies = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertIn(b'event: delivery', bodies)
+        self.assertNotIn(b'm2', bodies)
+
+    async def test_other_requests_are_passed_on(self):
+        application = mock.AsyncMock()
+        scope = {'type': 'http', 'path': '/notification-service/messages/', 'method': 'GET'}
+        await LiveFeedApp(application)(scope, None, None)
+        application.assert_awaited_once_with(scope, None, None)
+
+
+class DeliveryEventTestCase(TestCase):
+    def test_log_entries_are_published_on_commit(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        message = GilaMessage.objects.create(message='Test Message', category=category)
+        with mock.patch('notifications.utilities.live_feed.broadcaster') as broadcaster:
+            with self.captureOnCommitCallbacks(execute=True):
+                LogHistory.objects.create(user='Josh', channel_type='SMS', message=message)
+        event = broadcaster.publish.call_args.args[0]
+        self.assertEqual(event['type'], 'delivery')
+        self.assertEqual(event['category'], category.id)
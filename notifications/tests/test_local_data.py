@@ -0,0 +1,19 @@
+from django.test import TestCase
+
+from notifications.models import Category
+from notifications.utilities.local_data import DEFAULT_CATEGORIES, seed_categories
+
+
+class SeedCategoriesTestCase(TestCase):
+    def test_seed_categories_is_idempotent(self):
+        Category.objects.all().delete()
+        with self.assertNumQueries(1):
+            seed_categories()
+        seed_categories()
+        self.assertEqual(Category.objects.count(), len(DEFAULT_CATEGORIES))
+
+    def test_seed_categories_keeps_existing_rows(self):
+        category_id, _ = DEFAULT_CATEGORIES[0]
+        Category.objects.filter(id=category_id).update(description='Edited')
+        seed_categories()
+        self.assertEqual(Category.objects.get(id=category_id).description, 'Edited')
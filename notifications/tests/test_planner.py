@@ -0,0 +1,97 @@
+import threading
+import uuid
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from notifications.models import Category, GilaMessage, LogHistory, DeliveryRollup
+from notifications.utilities.auxiliar_models import User, SMSChannel, EmailChannel, ChannelType
+from notifications.utilities.local_data import LocalDataHandler
+from notifications.utilities import notifier
+from notifications.utilities.notifier import new_message_notify
+from notifications.utilities.planner import plan_dispatch, INLINE, SHARDED
+
+
+class PlanDispatchTestCase(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Test Category', description='Test Description')
+        self.handler = LocalDataHandler()
+        for identifier in range(5):
+            user = User(identifier, 'User {}'.format(identifier), 'user@mal.com', 454545, [self.category])
+            user.add_channel(SMSChannel(identifier, ChannelType.SMS, 'description'))
+            if identifier % 2:
+                user.add_channel(EmailChannel(identifier, ChannelType.EMAIL, 'description'))
+            self.handler.users.append(user)
+        self.handler.users.append(User(9, 'Unsubscribed', 'user@mal.com', 454545, []))
+        self.handler.index_subscriptions()
+
+    def test_counts_per_channel_type(self):
+        plan = plan_dispatch(self.category, self.handler)
+        self.assertEqual(plan.recipients, 5)
+        self.assertEqual(plan.deliveries, 7)
+        self.assertEqual(plan.as_dict()['channels'], {'SMS': 5, 'E-Mail': 2})
+
+    @override_settings(NOTIFICATION_INLINE_MAX_RECIPIENTS=10)
+    def test_small_audience_is_inline(self):
+        plan = plan_dispatch(self.category, self.handler)
+        self.assertEqual(plan.mode, INLINE)
+        self.assertEqual(len(plan.split(self.handler.get_subscribed_users(self.category))), 1)
+
+    @override_settings(NOTIFICATION_INLINE_MAX_RECIPIENTS=2, NOTIFICATION_SHARD_SIZE=2,
+                       NOTIFICATION_DISPATCH_WORKERS=8)
+    def test_large_audience_is_sharded(self):
+        plan = plan_dispatch(self.category, self.handler)
+        shards = plan.split(self.handler.get_subscribed_users(self.category))
+        self.assertEqual(plan.mode, SHARDED)
+        self.assertEqual([len(shard) for shard in shards], [2, 2, 1])
+        self.assertEqual(plan.as_dict()['shards'], 3)
+        self.assertEqual(plan.as_dict()['workers'], 3)
+
+    def test_unknown_category_has_no_recipients(self):
+        plan = plan_dispatch(Category(name='Other'), self.handler)
+        self.assertEqual((plan.recipients, plan.deliveries, plan.shards), (0, 0, 0))
+
+
+class ShardedNotifyTestCase(TransactionTestCase):
+    # Not a TestCase: worker threads only run outside a transaction (see notifier._notify).
+
+    def test_sharded_fan_out_matches_inline(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        message = GilaMessage.objects.create(message='Test Message', category=category)
+        inline = new_message_notify(message)
+
+        threads = []
+        notify_shard = notifier._notify_shard
+
+        def record_thread(message, users):
+            threads.append(threading.current_thread())
+            return notify_shard(message, users)
+
+        with override_settings(NOTIFICATION_INLINE_MAX_RECIPIENTS=0, NOTIFICATION_SHARD_SIZE=1,
+                               NOTIFICATION_DISPATCH_WORKERS=2), \
+                mock.patch.object(notifier, '_notify_shard', side_effect=record_thread):
+            sharded = new_message_notify(message)
+
+        self.assertEqual(sharded, inline)
+        self.assertEqual(len(threads), inline['recipients'])
+        self.assertNotIn(threading.main_thread(), threads)
+        deliveries = 2 * inline[LogHistory.SENT]
+        self.assertEqual(LogHistory.objects.filter(message=message).count(), deliveries)
+        self.assertEqual(sum(DeliveryRollup.objects.filter(category=category).values_list('count', flat=True)),
+                         deliveries)
+
+
+class DispatchPlanViewTestCase(TestCase):
+    def test_plan_is_a_dry_run(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        response = self.client.get(reverse('category-dispatch-plan', kwargs={'pk': category.id}))
+        self.assertEqual(response.status_code, 200)
+        plan = plan_dispatch(category)
+        self.assertEqual(response.json()['recipients'], plan.recipients)
+        self.assertEqual(response.json()['deliveries'], plan.deliveries)
+        self.assertFalse(LogHistory.objects.exists())
+
+    def test_unknown_category(self):
+        response = self.client.get(reverse('category-dispatch-plan', kwargs={'pk': uuid.uuid4()}))
+        self.assertEqual(response.status_code, 404)
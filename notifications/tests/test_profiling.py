@@ -0,0 +1,76 @@
+import contextvars
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+
+from notifications.middleware import ProfilingMiddleware
+from notifications.models import Category, GilaMessage
+from notifications.utilities.profiling import profile_thread
+
+
+def list_categories(request):
+    return HttpResponse(str(list(Category.objects.all())))
+
+
+def count_messages_in_thread(request):
+    def count_messages():
+        with profile_thread():
+            GilaMessage.objects.count()
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(count_messages,))
+    thread.start()
+    thread.join()
+    return HttpResponse()
+
+
+class ProfilingMiddlewareTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.settings = override_settings(
+            PROFILING_ENABLED=True, PROFILING_TOKEN='secret', PROFILING_DIR=Path(self.directory.name),
+            PROFILING_MAX_FILES=2,
+        )
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+
+    def test_disabled_by_default(self):
+        with override_settings(PROFILING_ENABLED=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                ProfilingMiddleware(list_categories)
+
+    def test_request_without_token_is_not_profiled(self):
+        response = ProfilingMiddleware(list_categories)(self.factory.get('/categories/', HTTP_X_PROFILE='wrong'))
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(list(Path(self.directory.name).iterdir()), [])
+
+    def test_request_with_token_is_profiled(self):
+        response = ProfilingMiddleware(list_categories)(self.factory.get('/categories/', HTTP_X_PROFILE='secret'))
+        profile = Path(self.directory.name) / '{}.prof'.format(response['X-Profile-Id'])
+        self.assertTrue(profile.exists())
+        self.assertIn('notifications_category', profile.with_suffix('.json').read_text())
+
+    def test_worker_threads_are_profiled_with_the_request(self):
+        request = self.factory.get('/messages/', HTTP_X_PROFILE='secret')
+        response = ProfilingMiddleware(count_messages_in_thread)(request)
+        profile = Path(self.directory.name) / '{}.prof'.format(response['X-Profile-Id'])
+        self.assertIn('notifications_gilamessage', profile.with_suffix('.json').read_text())
+        self.assertIn(b'count_messages', profile.read_bytes())
+
+    def test_old_profiles_are_rotated_and_summarized(self):
+        middleware = ProfilingMiddleware(list_categories)
+        for _ in range(3):
+            middleware(self.factory.get('/categories/', HTTP_X_PROFILE='secret'))
+        self.assertEqual(len(list(Path(self.directory.name).glob('*.prof'))), 2)
+
+        out = StringIO()
+        call_command('profile_hotspots', limit=5, stdout=out)
+        self.assertIn('2 profiles', out.getvalue())
+        self.assertIn('notifications_category', out.getvalue())
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from notifications.models import Category, GilaMessage, LogHistory, DeliveryRollup
+from notifications.utilities.auxiliar_models import ChannelType, SMSChannel
+from notifications.utilities.notifier import new_message_notify
+from notifications.utilities.providers import SimulatedProvider, ProviderError, RateLimited, get_provider, \
+    ConsoleProvider
+
+
+class SimulatedProviderTestCase(TestCase):
+    def test_latency_distributions(self):
+        sleeps = []
+        provider = SimulatedProvider(ChannelType.SMS, latency={'distribution': 'uniform', 'low': 0.1, 'high': 0.2},
+                                     seed=1, sleep=sleeps.append)
+        for _ in range(20):
+            provider.send('454545', 'text')
+        self.assertTrue(all(0.1 <= latency <= 0.2 for latency in sleeps))
+
+    def test_error_rate(self):
+        provider = SimulatedProvider(ChannelType.SMS, error_rate=1.0, sleep=lambda seconds: None)
+        with self.assertRaises(ProviderError):
+            provider.send('454545', 'text')
+
+    def test_rate_limit(self):
+        provider = SimulatedProvider(ChannelType.SMS, rate_limit=2, sleep=lambda seconds: None)
+        provider.send('454545', 'text')
+        provider.send('454545', 'text')
+        with self.assertRaises(RateLimited) as context:
+            provider.send('454545', 'text')
+        self.assertGreater(context.exception.retry_after, 0)
+
+    @override_settings(NOTIFICATION_PROVIDER_BACKEND='simulator',
+                       NOTIFICATION_PROVIDER_SIMULATOR={'SMS': {'error_rate': 1.0}})
+    def test_failed_deliveries_are_logged(self):
+        self.assertIsInstance(get_provider(ChannelType.SMS), SimulatedProvider)
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        message = GilaMessage.objects.create(message='Test Message', category=category)
+        self.assertEqual(SMSChannel(1, ChannelType.SMS, 'description').notify('Josh', message), LogHistory.FAILED)
+        self.assertEqual(LogHistory.objects.get(message=message).status, LogHistory.FAILED)
+
+    def test_console_is_the_default(self):
+        self.assertIsInstance(get_provider(ChannelType.EMAIL), ConsoleProvider)
+
+
+class DryRunTestCase(TestCase):
+    def test_dry_run_keeps_no_writes(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        message = GilaMessage.objects.create(message='Hello {user_name}', category=category)
+
+        summary = new_message_notify(message, dry_run=True)
+
+        self.assertGreater(summary['recipients'], 0)
+        self.assertGreater(summary[LogHistory.SENT], 0)
+        self.assertFalse(LogHistory.objects.exists())
+        self.assertFalse(DeliveryRollup.objects.exists())
+
+        self.assertEqual(new_message_notify(message), summary)
+        self.assertEqual(LogHistory.objects.count(), summary[LogHistory.SENT])
+
+    def test_dry_run_skips_rollups(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        message = GilaMessage.objects.create(message='Hello {user_name}', category=category)
+        with CaptureQueriesContext(connection) as queries:
+            new_message_notify(message, dry_run=True)
+        self.assertFalse([query for query in queries if 'notifications_deliveryrollup' in query['sql']])
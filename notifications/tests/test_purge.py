@@ -0,0 +1,90 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from ..models import Category, GilaMessage, LogHistory, DeliveryRollup
+from ..utilities.purge import purge_deleted
+from ..views import CategoryRetrieveUpdateDeleteView, MessageRetrieveUpdateDeleteView, LogHistoryViewSet, \
+    DeliveryStatsView
+
+
+class SoftDeleteTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.category = Category.objects.create(name='Busy Category', description='Test Description')
+        self.other = Category.objects.create(name='Other Category', description='Test Description')
+        self.messages = [GilaMessage.objects.create(message='Message {}'.format(index), category=self.category)
+                         for index in range(3)]
+        self.kept = GilaMessage.objects.create(message='Kept', category=self.other)
+        for message in self.messages + [self.kept]:
+            for user in ('Josh', 'Harrison'):
+                LogHistory.objects.create(user=user, channel_type='SMS', message=message)
+
+    def delete_category(self):
+        request = self.factory.delete('/categories/{}/'.format(self.category.id))
+        return CategoryRetrieveUpdateDeleteView.as_view()(request, pk=self.category.id)
+
+    def test_delete_category_is_soft(self):
+        with self.assertNumQueries(2):
+            response = self.delete_category()
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Category.objects.filter(pk=self.category.pk).exists())
+        self.assertTrue(Category.all_objects.filter(pk=self.category.pk).exists())
+        self.assertFalse(GilaMessage.objects.filter(category=self.category).exists())
+        self.assertEqual(LogHistory.objects.count(), 8)
+
+    def test_delete_message_is_soft(self):
+        message = self.messages[0]
+        request = self.factory.delete('/messages/{}/'.format(message.id))
+        response = MessageRetrieveUpdateDeleteView.as_view()(request, pk=message.id)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(GilaMessage.objects.filter(pk=message.pk).exists())
+        self.assertEqual(GilaMessage.objects.count(), 3)
+
+    def test_deleted_rows_leave_log_history_and_stats(self):
+        self.delete_category()
+        message = self.kept
+        request = self.factory.delete('/messages/{}/'.format(message.id))
+        MessageRetrieveUpdateDeleteView.as_view()(request, pk=message.id)
+        self.assertFalse(LogHistoryViewSet.queryset.exists())
+
+        request = self.factory.get('/stats/')
+        response = DeliveryStatsView.as_view()(request)
+        self.assertEqual([row['count'] for row in response.data], [0])
+
+    def test_admin_deletes_are_soft(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@mal.com', 'password'))
+        response = self.client.post(reverse('admin:notifications_gilamessage_delete', args=[self.kept.pk]),
+                                    {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        response = self.client.post(reverse('admin:notifications_category_changelist'), {
+            'action': 'delete_selected', '_selected_action': [self.category.pk], 'post': 'yes',
+        })
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(GilaMessage.objects.count(), 0)
+        self.assertEqual(GilaMessage.all_objects.count(), 4)
+        self.assertFalse(Category.objects.filter(pk=self.category.pk).exists())
+        self.assertEqual(LogHistory.objects.count(), 8)
+
+    def test_purge_deletes_in_chunks(self):
+        self.delete_category()
+        calls = []
+        totals = purge_deleted(chunk_size=4, progress=lambda stage, deleted: calls.append((stage, deleted)))
+
+        self.assertEqual(totals, {'log_history': 6, 'messages': 3, 'rollups': 1, 'categories': 1})
+        self.assertEqual(calls[:2], [('log_history', 4), ('log_history', 6)])
+        self.assertFalse(Category.all_objects.filter(pk=self.category.pk).exists())
+        self.assertEqual(list(GilaMessage.all_objects.all()), [self.kept])
+        self.assertEqual(LogHistory.objects.count(), 2)
+        self.assertEqual(DeliveryRollup.objects.get().category, self.other)
+
+    def test_purge_command(self):
+        self.delete_category()
+        out = StringIO()
+        call_command('purge_deleted', chunk_size=100, stdout=out)
+        self.assertIn('Purge finished', out.getvalue())
@@ -0,0 +1,64 @@
+import gzip
+import json
+import uuid
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.http import HttpResponse, JsonResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from notifications import middleware
+from notifications.middleware import CompressionMiddleware
+from notifications.renderers import FastJSONRenderer, FastJSONParser
+
+
+class FastJSONTestCase(SimpleTestCase):
+    def test_renderer_matches_stdlib_renderer(self):
+        data = {'id': uuid.uuid4(), 'time': timezone.now(), 'amount': Decimal('1.50'), 'text': 'ñandú',
+                'items': [1, None, True]}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_renderer_falls_back_without_orjson(self):
+        with mock.patch('notifications.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render({'a': 1}), b'{"a":1}')
+
+    def test_parser(self):
+        self.assertEqual(FastJSONParser().parse(BytesIO('{"message": "ñ"}'.encode())), {'message': 'ñ'})
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    payload = {'results': ['Benchmark message'] * 100}
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def respond(self, accept_encoding, response=None):
+        response = response or JsonResponse(self.payload)
+        request = self.factory.get('/messages/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        response = self.respond('gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.payload)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_brotli_preferred_when_available(self):
+        with mock.patch.object(middleware, 'brotli', mock.Mock(compress=lambda content, quality: b'br')):
+            self.assertEqual(self.respond('gzip, br')['Content-Encoding'], 'br')
+            self.assertEqual(self.respond('gzip, br;q=0.5')['Content-Encoding'], 'gzip')
+        with mock.patch.object(middleware, 'brotli', None):
+            self.assertEqual(self.respond('br, gzip')['Content-Encoding'], 'gzip')
+
+    def test_small_or_html_responses_are_not_compressed(self):
+        self.assertFalse(self.respond('gzip', JsonResponse({'a': 1})).has_header('Content-Encoding'))
+        html = HttpResponse('<p>csrf</p>' * 100)
+        self.assertFalse(self.respond('gzip', html).has_header('Content-Encoding'))
+
+    def test_identity(self):
+        self.assertFalse(self.respond('identity').has_header('Content-Encoding'))
+        self.assertFalse(self.respond('gzip;q=0').has_header('Content-Encoding'))
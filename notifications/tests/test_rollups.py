@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import Category, GilaMessage, LogHistory, DeliveryRollup
+from ..utilities import rollups
+from ..utilities.notifier import new_message_notify
+from ..utilities.rollups import rebuild
+from ..views import DeliveryStatsView
+
+
+class DeliveryRollupTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.category = Category.objects.create(name='Test Category', description='Test Description')
+        self.message = GilaMessage.objects.create(message='Test Message', category=self.category)
+        self.today = timezone.now()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def log(self, channel_type, time):
+        return LogHistory.objects.create(user='Josh', channel_type=channel_type, message=self.message, time=time)
+
+    def test_log_entries_update_rollups(self):
+        self.log('SMS', self.today)
+        self.log('SMS', self.today)
+        self.log('E-Mail', self.today)
+        self.log('SMS', self.yesterday)
+
+        counts = {
+            (rollup.day, rollup.channel_type): rollup.count
+            for rollup in DeliveryRollup.objects.filter(category=self.category)
+        }
+        self.assertEqual(counts, {
+            (timezone.localdate(self.today), 'SMS'): 2,
+            (timezone.localdate(self.today), 'E-Mail'): 1,
+            (timezone.localdate(self.yesterday), 'SMS'): 1,
+        })
+
+    def test_batch_updates_each_bucket_once(self):
+        with rollups.batch():
+            for _ in range(3):
+                self.log('SMS', self.today)
+            self.assertFalse(DeliveryRollup.objects.exists())
+        self.assertEqual(DeliveryRollup.objects.get().count, 3)
+
+    def test_fan_out_updates_rollups_per_bucket(self):
+        with CaptureQueriesContext(connection) as queries:
+            summary = new_message_notify(self.message)
+        rollup_writes = [query for query in queries if 'notifications_deliveryrollup' in query['sql']]
+        self.assertLessEqual(len(rollup_writes), 2 * len(DeliveryRollup.objects.all()))
+        self.assertEqual(sum(DeliveryRollup.objects.values_list('count', flat=True)), summary[LogHistory.SENT])
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self.log('SMS', self.today)
+        self.log('SMS', self.yesterday)
+        incremental = sorted(DeliveryRollup.objects.values_list('day', 'category', 'channel_type', 'count'))
+        DeliveryRollup.objects.filter(day__lt=timezone.localdate()).update(count=0)
+        rebuild()
+        self.assertEqual(sorted(DeliveryRollup.objects.values_list('day', 'category', 'channel_type', 'count')),
+                         incremental)
+
+    def test_rebuild_leaves_today_incremental(self):
+        self.log('SMS', self.today)
+        DeliveryRollup.objects.update(count=5)
+        rebuild()
+        self.assertEqual(DeliveryRollup.objects.get().count, 5)
+
+    def test_stats_view_filters(self):
+        self.log('SMS', self.today)
+        self.log('SMS', self.yesterday)
+        view = DeliveryStatsView.as_view()
+
+        response = view(self.factory.get('/stats/', {'category': self.category.id,
+                                                     'since': timezone.localdate(self.today).isoformat()}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['count'], 1)
+
+        response = view(self.factory.get('/stats/', {'since': 'yesterday'}))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = view(self.factory.get('/stats/', {'since': '2026-02-30'}))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
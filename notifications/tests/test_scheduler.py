@@ -0,0 +1,111 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from notifications.models import Category, GilaMessage, LogHistory
+from notifications.utilities.scheduler import MessageScheduler, dispatch_due_messages, dispatch_message, \
+    next_due_time
+
+
+class SchedulerTestCase(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Test Category', description='Test Description')
+        self.now = timezone.now()
+
+    def test_next_due_time_ignores_sent_and_unscheduled_messages(self):
+        GilaMessage.objects.create(message='Now', category=self.category)
+        GilaMessage.objects.create(message='Sent', category=self.category,
+                                   send_at=self.now - timedelta(hours=2), sent_at=self.now)
+        later = GilaMessage.objects.create(message='Later', category=self.category,
+                                           send_at=self.now + timedelta(hours=1))
+        self.assertEqual(next_due_time(), later.send_at)
+
+    def test_dispatch_due_messages_in_batches(self):
+        for index in range(5):
+            GilaMessage.objects.create(message='Due {}'.format(index), category=self.category,
+                                       send_at=self.now - timedelta(minutes=index))
+        future = GilaMessage.objects.create(message='Future', category=self.category,
+                                            send_at=self.now + timedelta(hours=1))
+
+        self.assertEqual(dispatch_due_messages(batch_size=2, now=self.now), 5)
+        self.assertEqual(GilaMessage.objects.filter(sent_at__isnull=True).count(), 1)
+        future.refresh_from_db()
+        self.assertIsNone(future.sent_at)
+
+    def test_dispatch_message_only_once(self):
+        message = GilaMessage.objects.create(message='Once', category=self.category, send_at=self.now)
+        self.assertTrue(dispatch_message(message))
+        self.assertFalse(dispatch_message(message))
+
+    def test_scheduler_sleeps_until_next_due_time(self):
+        scheduler = MessageScheduler(max_idle=60)
+        self.assertEqual(scheduler.seconds_until_next_due(now=self.now), 60)
+
+        GilaMessage.objects.create(message='Soon', category=self.category, send_at=self.now + timedelta(seconds=5))
+        self.assertAlmostEqual(scheduler.seconds_until_next_due(now=self.now), 5, places=3)
+
+    def test_due_messages_notify_subscribers(self):
+        message = GilaMessage.objects.create(message='Due', category=self.category, send_at=self.now)
+        dispatch_due_messages(now=self.now)
+        message.refresh_from_db()
+        self.assertIsNotNone(message.sent_at)
+        self.assertTrue(LogHistory.objects.filter(message=message).exists())
+
+    def test_failed_dispatch_is_rescheduled(self):
+        message = GilaMessage.objects.create(message='Fails', category=self.category, send_at=self.now)
+        with mock.patch('notifications.utilities.scheduler.new_message_notify', side_effect=RuntimeError):
+            self.assertEqual(dispatch_due_messages(now=self.now), 0)
+        message.refresh_from_db()
+        self.assertIsNone(message.sent_at)
+        self.assertGreater(message.send_at, self.now)
+
+        self.assertEqual(dispatch_due_messages(now=message.send_at), 1)
+
+    def test_scheduler_keeps_running_after_an_error(self):
+        scheduler = MessageScheduler(max_idle=0)
+        checks = []
+
+        def run_once():
+            checks.append(None)
+            if len(checks) == 1:
+                raise RuntimeError
+            scheduler.stop()
+            return 0
+
+        with mock.patch.object(scheduler, 'run_once', side_effect=run_once):
+            scheduler.run()
+        self.assertEqual(len(checks), 2)
+
+
+class SchedulerWorkerTestCase(TransactionTestCase):
+    # Not a TestCase: the worker thread must see the message created by the test.
+
+    def test_message_created_while_the_worker_sleeps(self):
+        category = Category.objects.create(name='Test Category', description='Test Description')
+        scheduler = MessageScheduler()
+
+        def run():
+            try:
+                scheduler.run()
+            finally:
+                connections.close_all()
+
+        worker = threading.Thread(target=run)
+        worker.start()
+        self.addCleanup(worker.join)
+        self.addCleanup(scheduler.stop)
+        time.sleep(0.2)
+
+        message = GilaMessage.objects.create(message='Now', category=category, send_at=timezone.now())
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            message.refresh_from_db()
+            if message.sent_at is not None:
+                break
+            time.sleep(0.05)
+        self.assertIsNotNone(message.sent_at)
@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import Category, GilaMessage, LogHistory
+from ..utilities.search import FTS_TABLE, load_recipients, search_messages, MAX_RECIPIENTS
+from ..views import MessageSearchView
+
+
+class MessageSearchTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.category = Category.objects.create(name='Sport', description='Test Description')
+        self.final = GilaMessage.objects.create(message='The final match is tonight', category=self.category)
+        self.twice = GilaMessage.objects.create(message='Match day: the match starts at noon', category=self.category)
+        self.other = GilaMessage.objects.create(message='Stock prices are up', category=self.category)
+        LogHistory.objects.create(user='Josh', channel_type='SMS', message=self.final)
+        LogHistory.objects.create(user='Dan', channel_type='SMS', message=self.final, status=LogHistory.FAILED)
+
+    def test_search_is_ranked(self):
+        self.assertEqual(list(search_messages('match')), [self.twice, self.final])
+        self.assertEqual(list(search_messages('final match')), [self.final])
+        self.assertEqual(list(search_messages('"final" match')), [self.final])
+
+    def test_quoted_phrases_keep_their_word_order(self):
+        self.assertEqual(list(search_messages('"final match"')), [self.final])
+        self.assertEqual(list(search_messages('"match final"')), [])
+        self.assertEqual(list(search_messages('"match starts')), [self.twice])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other.message = 'Match postponed'
+        self.other.save()
+        self.assertIn(self.other, search_messages('postponed'))
+        self.assertEqual(list(search_messages('stock')), [])
+
+        self.twice.delete()
+        self.assertCountEqual(search_messages('match'), [self.final, self.other])
+
+    def test_index_does_not_depend_on_rowids(self):
+        # VACUUM may renumber the rowids of a table without an INTEGER PRIMARY KEY.
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE {} SET rowid = -rowid'.format(GilaMessage._meta.db_table))
+        self.assertEqual(list(search_messages('match')), [self.twice, self.final])
+        self.assertEqual(list(search_messages('stock')), [self.other])
+
+    def test_rebuild_command_indexes_existing_messages(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {}'.format(FTS_TABLE))
+        self.assertEqual(list(search_messages('stock')), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(list(search_messages('stock')), [self.other])
+
+    def test_soft_deleted_messages_are_hidden(self):
+        GilaMessage.objects.filter(pk=self.final.pk).update(deleted_at=timezone.now())
+        self.assertEqual(list(search_messages('final')), [])
+
+    def test_search_view_lists_recipients(self):
+        response = MessageSearchView.as_view()(self.factory.get('/search/', {'q': 'final'}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        result = response.data['results'][0]
+        self.assertEqual(result['recipients'], [{'user': 'Josh', 'channel_type': 'SMS'}])
+        self.assertEqual(result['recipient_count'], 1)
+        self.assertGreater(result['rank'], 0)
+
+    def test_recipients_are_capped(self):
+        for index in range(MAX_RECIPIENTS + 5):
+            LogHistory.objects.create(user='User {}'.format(index), channel_type='SMS', message=self.twice)
+        with self.assertNumQueries(2):
+            recipients = load_recipients([self.final, self.twice, self.other])
+        self.assertEqual(recipients[self.twice.id][1], MAX_RECIPIENTS + 5)
+        self.assertEqual([recipient['user'] for recipient in recipients[self.twice.id][0]],
+                         ['User {}'.format(index) for index in range(MAX_RECIPIENTS)])
+        self.assertEqual(recipients[self.final.id], ([{'user': 'Josh', 'channel_type': 'SMS'}], 1))
+        self.assertEqual(recipients[self.other.id], ([], 0))
+
+    def test_search_view_requires_a_query(self):
+        response = MessageSearchView.as_view()(self.factory.get('/search/'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
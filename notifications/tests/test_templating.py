@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from notifications.models import Category, GilaMessage
+from notifications.utilities.auxiliar_models import ChannelType, SMSChannel
+from notifications.utilities.templating import compile_template, render_message, truncate_sms, MAX_LENGTHS, \
+    SMS_UCS2_MAX_LENGTH
+
+
+class TemplatingTestCase(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Sport', description='Test Description')
+
+    def message(self, text):
+        return GilaMessage(message=text, category=self.category)
+
+    def test_placeholders_are_substituted(self):
+        message = self.message('Hi {user_name}, news about {category}!')
+        self.assertEqual(render_message(message, ChannelType.EMAIL, 'Josh'), 'Hi Josh, news about Sport!')
+
+    def test_unknown_fields_and_invalid_templates_are_kept(self):
+        self.assertEqual(render_message(self.message('{unknown} {user_name}'), ChannelType.EMAIL, 'Dan'),
+                         '{unknown} Dan')
+        self.assertEqual(render_message(self.message('50% {off'), ChannelType.EMAIL, 'Dan'), '50% {off')
+
+    def test_sms_variant_is_truncated(self):
+        text = 'Hello {user_name} ' + 'x' * 300
+        sms = render_message(self.message(text), ChannelType.SMS, 'Josh')
+        email = render_message(self.message(text), ChannelType.EMAIL, 'Josh')
+        self.assertEqual(len(sms), MAX_LENGTHS['SMS'])
+        self.assertTrue(sms.endswith('...'))
+        self.assertEqual(email, 'Hello Josh ' + 'x' * 300)
+
+    def test_sms_limit_follows_the_encoding(self):
+        self.assertEqual(truncate_sms('€' * 100), '€' * 78 + '...')
+        unicode_sms = truncate_sms('Olá 👋 ' + 'x' * 100)
+        self.assertEqual(len(unicode_sms.encode('utf-16-le')) // 2, SMS_UCS2_MAX_LENGTH)
+        self.assertTrue(unicode_sms.endswith('...'))
+        emoji_sms = truncate_sms('👋' * 80)
+        self.assertEqual(emoji_sms, '👋' * 33 + '...')
+        self.assertEqual(truncate_sms('👋' * 35), '👋' * 35)
+        self.assertEqual(truncate_sms('Short ✓'), 'Short ✓')
+
+    def test_template_is_compiled_once_per_channel_type(self):
+        compile_template.cache_clear()
+        message = self.message('Hi {user_name}')
+        for name in ('Josh', 'Harrison', 'Dan'):
+            render_message(message, ChannelType.SMS, name)
+            render_message(message, ChannelType.EMAIL, name)
+        info = compile_template.cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 4)
+
+    def test_channel_renders_for_its_type(self):
+        channel = SMSChannel(1, ChannelType.SMS, 'description')
+        self.assertEqual(channel.render('Josh', self.message('{category} for {user_name}')), 'Sport for Josh')
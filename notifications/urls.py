@@ -1,12 +1,15 @@
 from django.urls import path
 
-from .views import CategoryListCreateView, CategoryRetrieveUpdateDeleteView, LogHistoryViewSet
+from .views import CategoryListCreateView, CategoryRetrieveUpdateDeleteView, LogHistoryViewSet, DeliveryStatsView
+from .views import CategoryDispatchPlanView
+from .views import MessageSearchView
 from .views import MessageListCreateView, MessageRetrieveUpdateDeleteView
 
 urlpatterns = [
     # Category URLs
     path('categories/', CategoryListCreateView.as_view(), name='category-list-create'),
     path('categories/<uuid:pk>/', CategoryRetrieveUpdateDeleteView.as_view(), name='category-retrieve-update-delete'),
+    path('categories/<uuid:pk>/plan/', CategoryDispatchPlanView.as_view(), name='category-dispatch-plan'),
 
     # Message URLs
     path('messages/', MessageListCreateView.as_view(), name='message-list-create'),
@@ -14,4 +17,10 @@ urlpatterns = [
 
     # Log History URLs
     path('log-history/', LogHistoryViewSet.as_view({'get': 'list'}), name='log-history-list'),
+
+    # Search URLs
+    path('search/', MessageSearchView.as_view(), name='message-search'),
+
+    # Stats URLs
+    path('stats/', DeliveryStatsView.as_view(), name='delivery-stats'),
 ]
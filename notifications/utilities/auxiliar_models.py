@@ -1,15 +1,19 @@
+import uuid
 from enum import Enum
 from functools import wraps
 from typing import List
 
-from notifications.models import Category, LogHistory, GilaMessage
+from notifications.models import Category, LogHistory
+from notifications.utilities.providers import get_provider, ProviderError, RateLimited
+from notifications.utilities.templating import render_message
 
 
 def log_notify(func):
     """
     Decorator function to log notifications.
 
-    This decorator logs notifications by creating a LogHistory entry in the database.
+    This decorator logs notifications by creating a LogHistory entry in the database, with the
+    outcome of the delivery.
 
     Args:
         func (function): The notification function to be decorated.
@@ -23,27 +27,60 @@ def log_notify(func):
         """
         Wrapper function for the decorated notification function.
 
+        Provider errors are recorded in the log entry's status instead of being raised, so one
+        failed delivery does not stop the fan-out.
+
         Args:
             self: The instance of the class.
             user (User): The user to be notified.
             message (GilaMessage): The notification message.
 
         Returns:
-            Any: The result of the original notification function.
+            str: The delivery status stored in the log entry.
         """
-        gila_message = GilaMessage.objects.get(id=message.id)
+        try:
+            func(self, user, message)
+            status = LogHistory.SENT
+        except RateLimited:
+            status = LogHistory.RATE_LIMITED
+        except ProviderError:
+            status = LogHistory.FAILED
         log_history = LogHistory(
             user=user,
-            message=gila_message,
-            channel_type=self.channel_type.value
+            message=message,
+            channel_type=self.channel_type.value,
+            status=status
         )
         log_history.save()
-        print("Registered a new entry for LogHistory in the database.")
-        return func(self, user, message)
+        return status
 
     return wrapper
 
 
+def _category_id(category):
+    """
+    Get the id of a category, accepting either a Category instance or an id.
+
+    Ids are normalized to UUID objects so they compare equal regardless of how they were given.
+    """
+    category_id = category.id if isinstance(category, Category) else category
+    return category_id if isinstance(category_id, uuid.UUID) else uuid.UUID(str(category_id))
+
+
+_category_sets = {}
+
+
+def _shared_categories(category_ids):
+    """
+    Get a shared tuple for a set of category ids.
+
+    Subscribers mostly share a handful of subscription combinations, so each combination is
+    stored once and every user holds a reference to it.
+    """
+    key = tuple(category_ids)
+    return _category_sets.setdefault(key, key)
+
+
 class ChannelType(Enum):
     """
     Enum representing the type of notification channels.
@@ -57,11 +94,15 @@ class Channel:
     """
     Represents a notification channel associated with a category.
 
+    Channels and users use __slots__ instead of an instance __dict__, so that holding a large
+    number of subscribers in memory stays affordable.
+
     Attributes:
         identifier (UUID): The unique identifier for the channel.
         channel_type (ChannelType): The type of the channel.
         description (str): A brief description of the channel.
     """
+    __slots__ = ('identifier', 'channel_type', 'description')
 
     def __init__(self, identifier, channel_type: ChannelType, description):
         self.identifier = identifier
@@ -71,6 +112,19 @@ class Channel:
     def __str__(self):
         return self.channel_type.value
 
+    def render(self, user, message):
+        """
+        Render the message text for a user on this channel.
+
+        Args:
+            user (str): The name of the user to notify.
+            message (GilaMessage): The message to render.
+
+        Returns:
+            str: The personalized text, within the channel's length limit.
+        """
+        return render_message(message, self.channel_type, user)
+
     @log_notify
     def notify(self, user, message):
         """
@@ -90,6 +144,7 @@ class SMSChannel(Channel):
     Attributes:
         phone_number (str): The phone number associated with the channel.
     """
+    __slots__ = ('phone_number',)
 
     def __init__(self, identifier, channel_type: ChannelType, description):
         super().__init__(identifier, channel_type, description)
@@ -113,7 +168,7 @@ class SMSChannel(Channel):
             user (User): The user to notify.
             message (str): The message to send via SMS.
         """
-        print("Notified by SMS to: {}".format(self.phone_number))
+        get_provider(self.channel_type).send(self.phone_number, self.render(user, message))
 
 
 class EmailChannel(Channel):
@@ -123,6 +178,7 @@ class EmailChannel(Channel):
     Attributes:
         email_address (str): The email address associated with the channel.
     """
+    __slots__ = ('email_address',)
 
     def __init__(self, identifier, channel_type: ChannelType, description):
         super().__init__(identifier, channel_type, description)
@@ -146,7 +202,7 @@ class EmailChannel(Channel):
             user (User): The user to notify.
             message (str): The message to send via email.
         """
-        print("Notified by Email to: {}".format(self.email_address))
+        get_provider(self.channel_type).send(self.email_address, self.render(user, message))
 
 
 class PushNotificationChannel(Channel):
@@ -156,6 +212,7 @@ class PushNotificationChannel(Channel):
     Attributes:
         device_token (str): The device token associated with the channel.
     """
+    __slots__ = ('device_token',)
 
     def __init__(self, identifier, channel_type: ChannelType, description):
         super().__init__(identifier, channel_type, description)
@@ -179,8 +236,7 @@ class PushNotificationChannel(Channel):
             user (User): The user to notify.
             message (str): The message to send via push notification.
         """
-        # Implement push notification logic here
-        print("Notified by PushNotification to: {}".format(self.device_token))
+        get_provider(self.channel_type).send(self.device_token, self.render(user, message))
 
 
 class User:
@@ -192,17 +248,19 @@ class User:
         name (str): The name of the user.
         email (str): The email address of the user.
         phone_number (int): The phone number of the user.
-        subscribed_categories (List[Category]): A list of subscribed categories.
-        channels (List[Channel]): A list of notification channels associated with the user.
+        subscribed_categories (tuple): The ids of the subscribed categories. Only ids are kept,
+            not Category instances, and users with the same subscriptions share one tuple.
+        channels (tuple): The notification channels associated with the user.
     """
+    __slots__ = ('identifier', 'name', 'email', 'phone_number', 'subscribed_categories', 'channels')
 
     def __init__(self, identifier, name, email, phone_number, categories=None, channels=None):
         self.identifier = identifier
         self.name = name
         self.email = email
         self.phone_number = phone_number
-        self.subscribed_categories: [Category] = categories if categories is not None else []
-        self.channels: [Channel] = channels if channels is not None else []
+        self.subscribed_categories = _shared_categories(_category_id(item) for item in categories or ())
+        self.channels = tuple(channels or ())
 
     def add_channel(self, channel: Channel):
         """
@@ -211,16 +269,30 @@ class User:
         Args:
             channel (Channel): The channel to add.
         """
-        self.channels.append(channel)
+        self.channels += (channel,)
 
     def subscribe_category(self, category: Category):
         """
         Subscribe the user to a category.
 
         Args:
-            category (Category): The category to subscribe to.
+            category (Category or UUID): The category, or category id, to subscribe to.
+        """
+        category_id = _category_id(category)
+        if category_id not in self.subscribed_categories:
+            self.subscribed_categories = _shared_categories(self.subscribed_categories + (category_id,))
+
+    def is_subscribed(self, category):
         """
-        self.subscribed_categories.append(category)
+        Check whether the user is subscribed to a category.
+
+        Args:
+            category (Category or UUID): The category, or category id, to check.
+
+        Returns:
+            bool: True if the user is subscribed to the category.
+        """
+        return _category_id(category) in self.subscribed_categories
 
     def send_notifications(self, message):
         """
@@ -228,9 +300,11 @@ class User:
 
         Args:
             message (str): The message to send via notifications.
+
+        Returns:
+            List[str]: The delivery status of each channel.
         """
-        for user_channel in self.channels:
-            user_channel.notify(self.name, message)
+        return [user_channel.notify(self.name, message) for user_channel in self.channels]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+from django.conf import settings
+
+DROPPED = object()
+
+
+class Subscription:
+    """
+    A live feed subscriber with a bounded event buffer.
+
+    Events are delivered to the subscriber's event loop. When the buffer is full the subscriber
+    is considered too slow: its buffer is discarded and it receives DROPPED, so publishers never
+    wait on a consumer.
+
+    Attributes:
+        filters (dict): Event keys and the values they must have, e.g. {'category': '<uuid>'}.
+        dropped (bool): True once the subscriber has overflowed its buffer.
+    """
+
+    def __init__(self, loop, max_buffer, filters=None):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_buffer + 1)
+        self.max_buffer = max_buffer
+        self.filters = {key: str(value) for key, value in (filters or {}).items() if value}
+        self.dropped = False
+
+    def matches(self, event):
+        """
+        Check whether an event passes the subscriber's filters.
+
+        Args:
+            event (dict): The event to check.
+
+        Returns:
+            bool: True if every filter matches the event.
+        """
+        return all(str(event.get(key)) == value for key, value in self.filters.items())
+
+    def put(self, event):
+        """
+        Buffer an event. Must be called from the subscriber's event loop.
+
+        Args:
+            event (dict): The event to buffer.
+        """
+        if self.dropped:
+            return
+        if self.queue.qsize() >= self.max_buffer:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = DROPPED
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        """
+        Wait for the next event.
+
+        Returns:
+            dict or DROPPED: The next event, or DROPPED if the subscriber fell behind.
+        """
+        return await self.queue.get()
+
+
+class Broadcaster:
+    """
+    In-process publish/subscribe hub for live delivery events.
+
+    publish() can be called from any thread (e.g. the thread running a sync view); events are
+    handed to each subscriber's event loop without blocking the publisher.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, filters=None, max_buffer=None):
+        """
+        Register a subscriber on the running event loop.
+
+        Args:
+            filters (dict): Event keys and the values they must have.
+            max_buffer (int): The number of events buffered before the subscriber is dropped.
+                Defaults to the LIVE_FEED_BUFFER_SIZE setting.
+
+        Returns:
+            Subscription: The new subscription.
+        """
+        if max_buffer is None:
+            max_buffer = getattr(settings, 'LIVE_FEED_BUFFER_SIZE', 1000)
+        subscription = Subscription(asyncio.get_running_loop(), max_buffer, filters)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove a subscriber.
+
+        Args:
+            subscription (Subscription): The subscription to remove.
+        """
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        """
+        Send an event to every matching subscriber.
+
+        Args:
+            event (dict): The event to publish. Values must be JSON serializable.
+        """
+        if not self._subscriptions:
+            return
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.dropped or not subscription.matches(event):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # The subscriber's event loop is closed.
+                self.unsubscribe(subscription)
+
+
+broadcaster = Broadcaster()
@@ -0,0 +1,69 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+def get_replica_alias():
+    """
+    Get the database alias of the read replica.
+
+    Returns:
+        str or None: The REPLICA_DATABASE_ALIAS setting if that database is configured, otherwise None.
+    """
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def is_reading_from_replica():
+    """
+    Check whether reads are currently routed to the read replica.
+
+    Returns:
+        bool: True inside use_replica() when a replica is configured.
+    """
+    return _replica_reads.get() and get_replica_alias() is not None
+
+
+@contextmanager
+def use_replica():
+    """
+    Route the reads made inside the block to the read replica.
+
+    Writes always go to the default database. Outside this block every read uses the default
+    database too, so only code that can tolerate replication lag opts in.
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    Database router that sends opted-in reads to the read replica.
+
+    Reads of the notifications models are routed to REPLICA_DATABASE_ALIAS inside use_replica()
+    (entered by ReplicaRoutingMiddleware for read-only API requests); everything else uses the
+    default database. Other apps' models, such as sessions and users, always read from the
+    default database, so authentication never depends on replication lag.
+    """
+    app_label = 'notifications'
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and model._meta.app_label == self.app_label:
+            return get_replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the default database.
+        databases = {'default', get_replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,168 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.response import Response
+
+from notifications.models import GilaMessage, IdempotencyKey
+from notifications.serializers import MessageSerializer
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field('key').max_length
+
+
+def get_ttl():
+    """
+    Get how long an idempotency key is remembered.
+
+    Returns:
+        timedelta: The IDEMPOTENCY_KEY_TTL setting (in seconds), 24 hours by default.
+    """
+    return timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60))
+
+
+def get_lease():
+    """
+    Get how long a request may hold a key before the key is considered abandoned, if it has not
+    created its message yet.
+
+    Returns:
+        timedelta: The IDEMPOTENCY_KEY_LEASE setting (in seconds), 60 by default.
+    """
+    return timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_LEASE', 60))
+
+
+def hash_request(body):
+    """
+    Hash a request body, to tell whether a reused key belongs to the same request.
+
+    Args:
+        body (bytes): The raw request body.
+
+    Returns:
+        str: The hex SHA-256 digest of the body.
+    """
+    return hashlib.sha256(body).hexdigest()
+
+
+def reserve(key, request_hash=''):
+    """
+    Reserve an idempotency key for the current request.
+
+    The unique index on the key makes the reservation atomic: when two requests race with
+    the same key, exactly one of them creates the row. An expired key is released first, so
+    it can be reused, and so is a key still in progress after the lease without a created
+    message: its request is assumed dead before creating anything (e.g. the process was
+    killed). Once a key has a message it is never taken over, however long the fan-out runs.
+
+    Args:
+        key (str): The value of the Idempotency-Key header.
+        request_hash (str): The hash of the request body, see hash_request.
+
+    Returns:
+        tuple: (IdempotencyKey or None, bool) The record and whether this request created it.
+            The record is None if the key was released by another request in the meantime.
+    """
+    now = timezone.now()
+    IdempotencyKey.objects.filter(key=key).filter(
+        Q(created_at__lt=now - get_ttl())
+        | Q(response_status__isnull=True, created_message__isnull=True, created_at__lt=now - get_lease())
+    ).delete()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(key=key, request_hash=request_hash), True
+    except IntegrityError:
+        return IdempotencyKey.objects.filter(key=key).first(), False
+
+
+def record_message(record, message):
+    """
+    Store the message created for a reserved key.
+
+    Call it in the transaction that creates the message, so the message is never committed
+    without its key pointing to it.
+
+    Args:
+        record (IdempotencyKey): The reserved key.
+        message (GilaMessage): The created message.
+
+    Returns:
+        bool: False if the key was taken over by another request in the meantime.
+    """
+    record.created_message = message.pk
+    return bool(IdempotencyKey.objects.filter(pk=record.pk).update(created_message=message.pk))
+
+
+def store_response(record, response):
+    """
+    Store the response of the request that reserved a key.
+
+    Args:
+        record (IdempotencyKey): The reserved key.
+        response (Response): The response returned to the client.
+    """
+    record.response_status = response.status_code
+    record.response_body = response.data
+    # A plain update, since the row is gone if the lease expired and another request took the key over.
+    IdempotencyKey.objects.filter(pk=record.pk).update(
+        response_status=record.response_status, response_body=record.response_body
+    )
+
+
+def release(record):
+    """
+    Release a reserved key, so the request can be retried.
+
+    A key whose message was already created is kept, so a retry gets that message back
+    instead of creating another one.
+
+    Args:
+        record (IdempotencyKey): The reserved key.
+    """
+    if record.created_message is None:
+        record.delete()
+
+
+def replay(record, request_hash=''):
+    """
+    Build the response for a request that reuses a key.
+
+    Args:
+        record (IdempotencyKey or None): The existing key.
+        request_hash (str): The hash of the body of the request reusing the key.
+
+    Returns:
+        Response: The original response, 422 Unprocessable Entity if the key was used for a
+            different request body, 201 with the message if the original request created it but
+            has not finished, or 409 Conflict if the original request is still in progress.
+    """
+    if record is not None and record.request_hash and record.request_hash != request_hash:
+        return Response(
+            {'detail': 'This {} was already used for a different request.'.format(HEADER)},
+            status=422,
+        )
+    if record is not None and record.response_status is None and record.created_message is not None:
+        message = GilaMessage.all_objects.filter(pk=record.created_message).first()
+        if message is not None:
+            return Response(MessageSerializer(message).data, status=201, headers={REPLAYED_HEADER: 'true'})
+    if record is None or record.response_status is None:
+        return Response(
+            {'detail': 'A request with this {} is still being processed.'.format(HEADER)},
+            status=409,
+        )
+    return Response(record.response_body, status=record.response_status, headers={REPLAYED_HEADER: 'true'})
+
+
+def purge_expired():
+    """
+    Delete the idempotency keys older than the TTL.
+
+    Returns:
+        int: The number of deleted keys.
+    """
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - get_ttl()).delete()
+    return deleted
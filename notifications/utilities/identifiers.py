@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_timestamp = 0
+_last_counter = 0
+
+
+def uuid7(timestamp=None):
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits hold the Unix time in milliseconds, followed by a 12-bit counter and 62
+    random bits. Ids generated by this process therefore increase monotonically, so new rows
+    are appended to the end of a primary key B-tree instead of being scattered across it,
+    and ordering by primary key is ordering by creation time.
+
+    Args:
+        timestamp (datetime): Generate the id for this time instead of now. Used to give
+            existing rows ids that sort by their own timestamp.
+
+    Returns:
+        uuid.UUID: The generated id.
+    """
+    global _last_timestamp, _last_counter
+
+    if timestamp is not None:
+        timestamp_ms = int(timestamp.timestamp() * 1000)
+        counter = int.from_bytes(os.urandom(2), 'big') & 0xFFF
+    else:
+        with _lock:
+            timestamp_ms = time.time_ns() // 1_000_000
+            if timestamp_ms > _last_timestamp:
+                # Start the counter in the lower half, so there is room to increment it within the millisecond.
+                counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+            else:
+                timestamp_ms = _last_timestamp
+                counter = _last_counter + 1
+                if counter > 0xFFF:
+                    timestamp_ms += 1
+                    counter = 0
+            _last_timestamp = timestamp_ms
+            _last_counter = counter
+
+    random_bits = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | random_bits
+    return uuid.UUID(int=value)
@@ -0,0 +1,154 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from notifications.utilities.broadcaster import broadcaster, DROPPED
+
+FILTERS = ('message', 'category')
+HEADERS = [
+    (b'content-type', b'text/event-stream'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+]
+
+
+def delivery_event(log_history):
+    """
+    Build the live feed event for a new LogHistory entry.
+
+    Args:
+        log_history (LogHistory): The log entry.
+
+    Returns:
+        dict: The event.
+    """
+    return {
+        'type': 'delivery',
+        'id': log_history.id,
+        'time': log_history.time,
+        'user': log_history.user,
+        'channel_type': log_history.channel_type,
+        'status': log_history.status,
+        'message': log_history.message_id,
+        'category': log_history.message.category_id,
+    }
+
+
+def message_status_event(message, status):
+    """
+    Build the live feed event for a message status change.
+
+    Args:
+        message (GilaMessage): The message.
+        status (str): The new status, 'sending', 'sent' or 'failed'.
+
+    Returns:
+        dict: The event.
+    """
+    return {
+        'type': 'message',
+        'message': message.id,
+        'category': message.category_id,
+        'status': status,
+    }
+
+
+def publish(event):
+    """
+    Publish an event once the current transaction commits, so rolled back writes are never streamed.
+
+    Events only reach the subscribers of this process: deliveries made by the run_scheduler
+    worker or by other server processes are not streamed.
+
+    Args:
+        event (dict): The event to publish.
+    """
+    transaction.on_commit(lambda: broadcaster.publish(event))
+
+
+def format_event(event):
+    """
+    Format an event as a Server-Sent Events frame.
+
+    Args:
+        event (dict or DROPPED): The event to format.
+
+    Returns:
+        bytes: The SSE frame.
+    """
+    if event is DROPPED:
+        return b'event: dropped\ndata: {}\n\n'
+    return 'event: {}\ndata: {}\n\n'.format(event['type'], json.dumps(event, cls=DjangoJSONEncoder)).encode()
+
+
+class LiveFeedApp:
+    """
+    ASGI application that serves the live delivery feed and passes every other request on.
+
+    GET <path> opens a Server-Sent Events stream of delivery and message status events,
+    optionally filtered with the ?message=<uuid> and ?category=<uuid> query parameters.
+    Subscribers that cannot keep up are sent a final 'dropped' event and disconnected.
+
+    Attributes:
+        application: The ASGI application handling the other requests.
+        path (str): The path of the feed.
+        keepalive (float): Seconds of inactivity after which a comment line is sent to keep the connection open.
+    """
+
+    def __init__(self, application, path='/notification-service/live/', keepalive=None):
+        self.application = application
+        self.path = path
+        self.keepalive = keepalive if keepalive is not None else getattr(settings, 'LIVE_FEED_KEEPALIVE', 15)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == self.path:
+            await self.stream(scope, receive, send)
+        else:
+            await self.application(scope, receive, send)
+
+    async def stream(self, scope, receive, send):
+        if scope['method'] not in ('GET', 'HEAD'):
+            await send({'type': 'http.response.start', 'status': 405, 'headers': [(b'allow', b'GET, HEAD')]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.start', 'status': 200, 'headers': HEADERS})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        query = parse_qs(scope.get('query_string', b'').decode())
+        filters = {name: query[name][0] for name in FILTERS if name in query}
+        # Subscribe before answering, so no event published after the headers are sent is missed.
+        subscription = broadcaster.subscribe(filters)
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        try:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': HEADERS})
+            while True:
+                next_event = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected}, timeout=self.keepalive, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    next_event.cancel()
+                    return
+                if next_event not in done:
+                    next_event.cancel()
+                    await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+                    continue
+                event = next_event.result()
+                await send({'type': 'http.response.body', 'body': format_event(event), 'more_body': True})
+                if event is DROPPED:
+                    break
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            broadcaster.unsubscribe(subscription)
+            disconnected.cancel()
+
+    @staticmethod
+    async def wait_for_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
@@ -1,5 +1,38 @@
+from collections import Counter, defaultdict
+
 from notifications.models import Category
-from notifications.utilities.auxiliar_models import User, SMSChannel, EmailChannel, ChannelType, PushNotificationChannel
+from notifications.utilities import response_cache
+from notifications.utilities.auxiliar_models import User, SMSChannel, EmailChannel, ChannelType, PushNotificationChannel, \
+    _category_id
+
+
+DEFAULT_CATEGORIES = (
+    ("b0b691d0-4e2f-4b47-8e61-579c72e4c4f2", 'sport'),
+    ("6f7e6f3b-e9b2-4e44-9f3b-1ec25d19aa8e", 'Finance'),
+    ("58d3bea3-d5e0-4b47-9ac4-27836e73e6eb", 'Movies'),
+)
+
+
+def seed_categories(using='default'):
+    """
+    Create the predefined categories that don't exist yet.
+
+    All categories are written with a single INSERT that skips existing ids, so seeding is
+    idempotent and can run on every deploy.
+
+    Args:
+        using (str): The database alias to seed.
+
+    Returns:
+        int: The number of predefined categories.
+    """
+    categories = [
+        Category(id=category_id, name=name, description='Default Description')
+        for category_id, name in DEFAULT_CATEGORIES
+    ]
+    Category.objects.using(using).bulk_create(categories, ignore_conflicts=True)
+    response_cache.invalidate(response_cache.CATEGORIES)
+    return len(categories)
 
 
 class LocalDataHandler:
@@ -9,49 +42,34 @@ class LocalDataHandler:
     Attributes:
         users (List[User]): A list of User objects containing user information and subscriptions.
         categories (QuerySet): A QuerySet containing Category objects representing message categories.
+        subscriptions (dict): The subscribed users of each category id, built by index_subscriptions.
     """
 
     def __init__(self):
         self.users: [User] = []
         self.categories = None
+        self.subscriptions = {}
 
     def load_categories(self):
         """
-        Load predefined categories or create them if they don't exist in the database.
+        Load the categories from the database.
+
+        The predefined categories are created by seed_categories, not here, so loading is a
+        single read.
         """
         self.categories = Category.objects.all()
 
-        sport_id = "b0b691d0-4e2f-4b47-8e61-579c72e4c4f2"
-        try:
-            sport_category = Category.objects.get(id=sport_id)
-        except Category.DoesNotExist:
-            sport_category = Category.objects.create(id=sport_id, name='sport', description='Default Description')
-            sport_category.save()
-
-        finance_id = "6f7e6f3b-e9b2-4e44-9f3b-1ec25d19aa8e"
-        try:
-            finance_category = Category.objects.get(id=finance_id)
-        except Category.DoesNotExist:
-            finance_category = Category.objects.create(id=finance_id, name='Finance', description='Default Description')
-            finance_category.save()
-
-        movies_id = "58d3bea3-d5e0-4b47-9ac4-27836e73e6eb"
-        try:
-            movies_category = Category.objects.get(id=movies_id)
-        except Category.DoesNotExist:
-            movies_category = Category.objects.create(id=movies_id, name='Movies', description='Default Description')
-            movies_category.save()
-
     def load_local_users(self):
         """
         Load local user data with predefined channels and subscriptions.
         """
-        josh = User(100, "Josh", "josh@mal.com", 454545, self.categories)
+        category_ids = [category.id for category in self.categories]
+        josh = User(100, "Josh", "josh@mal.com", 454545, category_ids)
         sms_channel = SMSChannel(2000, ChannelType.SMS, "description")
         sms_channel.set_phone_number(josh.phone_number)
         josh.add_channel(sms_channel)
 
-        harrison = User(101, "Harrison", "harrison@mal.com", 454545, self.categories[1:])
+        harrison = User(101, "Harrison", "harrison@mal.com", 454545, category_ids[1:])
         email_channel = EmailChannel(2001, ChannelType.EMAIL, "description")
         email_channel.set_email(harrison.email)
         sms_channel = SMSChannel(2005, ChannelType.SMS, "description")
@@ -63,16 +81,31 @@ class LocalDataHandler:
         self.users.append(josh)
         self.users.append(harrison)
         self.users.append(dan)
+        self.index_subscriptions()
         self.print_users_subscriptions()
 
+    def index_subscriptions(self):
+        """
+        Index the loaded users by subscribed category id.
+
+        The index is built in one pass over the users, so looking up or counting the
+        subscribers of a category no longer scans every user.
+        """
+        subscriptions = defaultdict(list)
+        for user in self.users:
+            for category_id in user.subscribed_categories:
+                subscriptions[category_id].append(user)
+        self.subscriptions = dict(subscriptions)
+
     def print_users_subscriptions(self):
         """
         Print users' subscriptions and channel configurations.
         """
+        category_names = {category.id: category.name for category in self.categories}
         for user in self.users:
             print("user: '{}' is subscribed to: '{}' with channels: {}".format(
                 user.name,
-                [item.name for item in user.subscribed_categories],
+                [category_names.get(item, str(item)) for item in user.subscribed_categories],
                 [item.channel_type.value for item in user.channels])
             )
 
@@ -86,8 +119,19 @@ class LocalDataHandler:
         Returns:
             List[User]: A list of User objects subscribed to the given category.
         """
-        users = []
-        for item in self.users:
-            if category in item.subscribed_categories:
-                users.append(item)
-        return users
+        return list(self.subscriptions.get(_category_id(category), ()))
+
+    def count_recipients(self, category):
+        """
+        Count the subscribers of a category per channel type.
+
+        Args:
+            category (Category): The category to count the subscribers of.
+
+        Returns:
+            Counter: The number of subscribed users reachable through each ChannelType.
+        """
+        counts = Counter()
+        for user in self.subscriptions.get(_category_id(category), ()):
+            counts.update(channel.channel_type for channel in user.channels)
+        return counts
@@ -1,12 +1,18 @@
+import contextvars
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-from notifications.utilities import local_data
+from django.db import connection, connections, transaction
+
+from notifications.utilities import profiling, providers, rollups
 from notifications.utilities.local_data import LocalDataHandler
+from notifications.utilities.planner import plan_dispatch
 
 logger = logging.getLogger(__name__)
 
 
-def new_message_notify(message):
+def new_message_notify(message, dry_run=False):
     """
     Notifies subscribed users via the appropriate channels based on the given message.
 
@@ -15,12 +21,30 @@ def new_message_notify(message):
     appropriate channel(s) for notification and creates a log history entry. The
     notification message is logged to the console.
 
+    The fan-out is planned first (see notifications.utilities.planner): small audiences are
+    notified inline, large broadcasts are split into shards sent by a pool of worker threads.
+
+    In dry-run mode the whole pipeline runs (subscriber resolution, rendering and logging),
+    but notifications go to a provider that sends nothing, and every database write is
+    rolled back at the end. Delivery rollups and live feed events are skipped, and shards
+    run one after another, since the dry run's transaction can't be shared with worker threads.
+
     Parameters:
         message (GilaMessage): The GilaMessage object containing the notification details.
+        dry_run (bool): Run the pipeline without contacting providers or keeping its writes.
 
     Returns:
-        None
+        dict: The number of subscribed users ('recipients') and of deliveries per status.
     """
+    if not dry_run:
+        return _notify(message)
+    with providers.dry_run(), transaction.atomic():
+        summary = _notify(message)
+        transaction.set_rollback(True)
+    return summary
+
+
+def _notify(message):
     category = message.category
 
     # Load users and categories
@@ -29,6 +53,41 @@ def new_message_notify(message):
     local_data_handler.load_local_users()
 
     users = local_data_handler.get_subscribed_users(category)
-    for user in users:
-        print("User notified: {}:".format(user.name))
-        user.send_notifications(message)
+    plan = plan_dispatch(category, local_data_handler)
+    shards = plan.split(users)
+    statuses = Counter()
+    if len(shards) <= 1 or plan.workers <= 1 or connection.in_atomic_block:
+        # Worker threads use their own connections, which can't see (or roll back with)
+        # the writes of an open transaction, so shards run here one after another.
+        for shard in shards:
+            statuses.update(_notify_shard(message, shard))
+    else:
+        logger.info("Sending %s deliveries to %s recipients in %s shards",
+                    plan.deliveries, plan.recipients, len(shards))
+        # Each shard runs in a copy of the caller's context, so the provider, read replica and
+        # profiling settings of the request apply to it too.
+        with ThreadPoolExecutor(max_workers=min(plan.workers, len(shards))) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, _notify_shard_in_thread, message, shard)
+                for shard in shards
+            ]
+            for future in futures:
+                statuses.update(future.result())
+    return dict(statuses, recipients=len(users))
+
+
+def _notify_shard(message, users):
+    statuses = Counter()
+    with rollups.batch():
+        for user in users:
+            print("User notified: {}:".format(user.name))
+            statuses.update(user.send_notifications(message))
+    return statuses
+
+
+def _notify_shard_in_thread(message, users):
+    try:
+        with profiling.profile_thread():
+            return _notify_shard(message, users)
+    finally:
+        connections.close_all()
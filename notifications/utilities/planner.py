@@ -0,0 +1,109 @@
+from django.conf import settings
+
+from notifications.utilities.local_data import LocalDataHandler
+
+INLINE = 'inline'
+SHARDED = 'sharded'
+
+
+class DispatchPlan:
+    """
+    The expected size of a message fan-out and how it will be executed.
+
+    Attributes:
+        category (Category): The category of the message.
+        channels (Counter): The number of deliveries per ChannelType.
+        recipients (int): The number of subscribed users.
+        shard_size (int): The number of recipients handled by each shard.
+        workers (int): The number of shards sent at the same time.
+    """
+
+    def __init__(self, category, channels, recipients, shard_size, workers):
+        self.category = category
+        self.channels = channels
+        self.recipients = recipients
+        self.shard_size = shard_size
+        self.workers = workers
+
+    @property
+    def deliveries(self):
+        """
+        int: The number of provider calls the fan-out will make.
+        """
+        return sum(self.channels.values())
+
+    @property
+    def mode(self):
+        """
+        str: INLINE for small audiences, sent one by one, or SHARDED for large broadcasts.
+        """
+        return INLINE if self.recipients <= settings.NOTIFICATION_INLINE_MAX_RECIPIENTS else SHARDED
+
+    @property
+    def shards(self):
+        """
+        int: The number of shards the recipients are split into.
+        """
+        if self.mode == INLINE:
+            return 1 if self.recipients else 0
+        return -(-self.recipients // self.shard_size)
+
+    def split(self, users):
+        """
+        Split the recipients into shards.
+
+        Args:
+            users (List[User]): The subscribed users.
+
+        Returns:
+            List[List[User]]: The users of each shard.
+        """
+        if self.mode == INLINE:
+            return [users] if users else []
+        return [users[start:start + self.shard_size] for start in range(0, len(users), self.shard_size)]
+
+    def as_dict(self):
+        """
+        Get the plan as a JSON-serializable dict.
+
+        Returns:
+            dict: The plan, with the deliveries keyed by channel type value.
+        """
+        return {
+            'category': self.category.id,
+            'recipients': self.recipients,
+            'deliveries': self.deliveries,
+            'channels': {channel_type.value: count for channel_type, count in self.channels.items()},
+            'mode': self.mode,
+            'shards': self.shards,
+            'shard_size': self.shard_size,
+            'workers': min(self.workers, self.shards) if self.mode == SHARDED else 1,
+        }
+
+
+def plan_dispatch(category, local_data_handler=None):
+    """
+    Plan the fan-out of a message of the given category without sending anything.
+
+    The counts come from the subscription index of the local data, so planning costs one
+    lookup per category, not a pass over every user.
+
+    Args:
+        category (Category): The category of the message.
+        local_data_handler (LocalDataHandler): Loaded local data to plan with. Loaded here if
+            not given.
+
+    Returns:
+        DispatchPlan: The number of recipients and deliveries, and how they will be sent.
+    """
+    if local_data_handler is None:
+        local_data_handler = LocalDataHandler()
+        local_data_handler.load_categories()
+        local_data_handler.load_local_users()
+    channels = local_data_handler.count_recipients(category)
+    recipients = len(local_data_handler.get_subscribed_users(category))
+    return DispatchPlan(
+        category, channels, recipients,
+        shard_size=settings.NOTIFICATION_SHARD_SIZE,
+        workers=settings.NOTIFICATION_DISPATCH_WORKERS,
+    )
@@ -0,0 +1,202 @@
+import contextvars
+import cProfile
+import hmac
+import json
+import pstats
+import random
+import re
+import time
+import uuid
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+_current_profiler = contextvars.ContextVar('current_profiler', default=None)
+
+
+def get_profile_dir():
+    """
+    Get the directory where request profiles are written.
+
+    Returns:
+        Path: The PROFILING_DIR setting, BASE_DIR / 'profiles' by default.
+    """
+    return Path(getattr(settings, 'PROFILING_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def should_profile(request):
+    """
+    Decide whether a request is profiled.
+
+    A request is profiled when it carries the PROFILING_HEADER header with the PROFILING_TOKEN
+    value, or when it is picked by the PROFILING_SAMPLE_RATE sampling.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        bool: True if the request should be profiled.
+    """
+    token = getattr(settings, 'PROFILING_TOKEN', None)
+    value = request.headers.get(getattr(settings, 'PROFILING_HEADER', 'X-Profile'))
+    if token and value and hmac.compare_digest(value, token):
+        return True
+    sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that records every SQL statement with its duration.
+
+    Attributes:
+        queries (list): One {'database', 'sql', 'duration'} dictionary per executed statement.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({'database': self.alias, 'sql': sql, 'duration': time.perf_counter() - start})
+
+
+class RequestProfiler:
+    """
+    Profiles one request with cProfile and records its SQL queries.
+
+    Attributes:
+        profile_id (str): The name of the files the profile is written to.
+        profile (cProfile.Profile): The collected profile.
+        recorders (list): The QueryRecorder of each database connection.
+        thread_profiles (list): The profiles of the worker threads started by the request, see profile_thread.
+        duration (float): The wall time of the profiled block, in seconds.
+    """
+
+    def __init__(self, request):
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+        self.profile_id = '{}-{}-{}-{}'.format(
+            timezone.now().strftime('%Y%m%dT%H%M%S'), request.method, slug[:60], uuid.uuid4().hex[:8]
+        )
+        self.request_info = {'method': request.method, 'path': request.get_full_path()}
+        self.profile = cProfile.Profile()
+        self.recorders = [QueryRecorder(connection.alias) for connection in connections.all()]
+        self.thread_profiles = []
+        self.duration = 0.0
+        self._stack = None
+        self._start = None
+        self._token = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for recorder in self.recorders:
+            self._stack.enter_context(connections[recorder.alias].execute_wrapper(recorder))
+        self._token = _current_profiler.set(self)
+        self._start = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.duration = time.perf_counter() - self._start
+        _current_profiler.reset(self._token)
+        self._stack.close()
+
+    def save(self, status_code=None):
+        """
+        Write the profile (.prof) and the request summary with SQL timings (.json), then rotate old profiles.
+
+        Args:
+            status_code (int): The status of the response.
+
+        Returns:
+            Path: The path of the .prof file.
+        """
+        directory = get_profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / '{}.prof'.format(self.profile_id)
+        stats = pstats.Stats(self.profile)
+        for thread_profile in self.thread_profiles:
+            stats.add(thread_profile)
+        stats.dump_stats(str(path))
+        queries = [query for recorder in self.recorders for query in recorder.queries]
+        summary = dict(
+            self.request_info,
+            status=status_code,
+            duration=self.duration,
+            query_count=len(queries),
+            query_duration=sum(query['duration'] for query in queries),
+            queries=queries,
+        )
+        path.with_suffix('.json').write_text(json.dumps(summary, indent=2))
+        rotate(directory, getattr(settings, 'PROFILING_MAX_FILES', 100))
+        return path
+
+
+@contextmanager
+def profile_thread():
+    """
+    Profile the work of a worker thread as part of the request that started it.
+
+    cProfile and the database execute wrappers only see the thread they were installed in, so
+    a thread running in a copy of a profiled request's context (contextvars.copy_context)
+    profiles itself and records its queries here; the request merges the thread profiles into
+    its own when it is saved. Outside a profiled request this does nothing.
+    """
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    with ExitStack() as stack:
+        for recorder in profiler.recorders:
+            stack.enter_context(connections[recorder.alias].execute_wrapper(recorder))
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profiler.thread_profiles.append(profile)
+
+
+def rotate(directory, max_files):
+    """
+    Delete the oldest profiles so that at most max_files are kept.
+
+    Args:
+        directory (Path): The profile directory.
+        max_files (int): The number of profiles to keep.
+    """
+    profiles = sorted(directory.glob('*.prof'), key=lambda item: item.stat().st_mtime)
+    for path in profiles[:max(len(profiles) - max_files, 0)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.json').unlink(missing_ok=True)
+
+
+def summarize_queries(directory, limit=20):
+    """
+    Aggregate the SQL timings of every captured profile.
+
+    Args:
+        directory (Path): The profile directory.
+        limit (int): The number of statements to return.
+
+    Returns:
+        list: (sql, count, total_duration) tuples, slowest total first.
+    """
+    totals = defaultdict(lambda: [0, 0.0])
+    for path in directory.glob('*.json'):
+        for query in json.loads(path.read_text()).get('queries', []):
+            total = totals[query['sql']]
+            total[0] += 1
+            total[1] += query['duration']
+    ranked = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+    return [(sql, count, duration) for sql, (count, duration) in ranked[:limit]]
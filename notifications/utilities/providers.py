@@ -0,0 +1,176 @@
+import contextvars
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_dry_run = contextvars.ContextVar('dry_run', default=False)
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+class ProviderError(Exception):
+    """
+    Raised when a provider fails to deliver a notification.
+    """
+
+
+class RateLimited(ProviderError):
+    """
+    Raised when a provider rejects a notification because its rate limit was exceeded.
+
+    Attributes:
+        retry_after (float): Seconds until the provider accepts notifications again.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__("Rate limit exceeded, retry after {:.3f}s.".format(retry_after))
+        self.retry_after = retry_after
+
+
+class ConsoleProvider:
+    """
+    Provider that prints every notification instead of sending it.
+    """
+
+    def __init__(self, channel_type):
+        self.channel_type = channel_type
+
+    def send(self, address, text):
+        print("Notified by {} to: {}: {}".format(self.channel_type.value, address, text))
+
+
+class DryRunProvider:
+    """
+    Provider that accepts every notification without sending or printing it.
+    """
+
+    def __init__(self, channel_type):
+        self.channel_type = channel_type
+
+    def send(self, address, text):
+        pass
+
+
+class SimulatedProvider:
+    """
+    Provider that behaves like a real one without contacting anything.
+
+    Every send waits for a latency drawn from the configured distribution, fails with the
+    configured probability, and is rejected with RateLimited when the configured rate is
+    exceeded (token bucket).
+
+    Attributes:
+        channel_type (ChannelType): The channel the provider serves.
+        latency (dict): {'distribution': 'constant' | 'uniform' | 'lognormal', ...} with the
+            parameters of the distribution, in seconds: 'value'; 'low' and 'high'; or 'median' and 'sigma'.
+        error_rate (float): The probability that a send fails, between 0 and 1.
+        rate_limit (float or None): The sends per second accepted, or None for no limit.
+    """
+
+    def __init__(self, channel_type, latency=None, error_rate=0.0, rate_limit=None, seed=None, sleep=time.sleep):
+        self.channel_type = channel_type
+        self.latency = latency or {'distribution': 'constant', 'value': 0.0}
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = rate_limit or 0.0
+        self._refilled_at = time.monotonic()
+
+    def sample_latency(self):
+        """
+        Draw a latency from the configured distribution.
+
+        Returns:
+            float: The latency in seconds.
+        """
+        distribution = self.latency.get('distribution', 'constant')
+        if distribution == 'uniform':
+            return self.random.uniform(self.latency['low'], self.latency['high'])
+        if distribution == 'lognormal':
+            return self.random.lognormvariate(math.log(self.latency['median']), self.latency.get('sigma', 0.5))
+        return self.latency.get('value', 0.0)
+
+    def _take_token(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                raise RateLimited((1 - self._tokens) / self.rate_limit)
+            self._tokens -= 1
+
+    def send(self, address, text):
+        if self.rate_limit:
+            self._take_token()
+        with self._lock:
+            latency = self.sample_latency()
+            failed = self.random.random() < self.error_rate
+        self.sleep(latency)
+        if failed:
+            raise ProviderError("Simulated {} provider error.".format(self.channel_type.value))
+
+
+def _create_provider(channel_type):
+    backend = getattr(settings, 'NOTIFICATION_PROVIDER_BACKEND', 'console')
+    if backend == 'simulator':
+        options = getattr(settings, 'NOTIFICATION_PROVIDER_SIMULATOR', {}).get(channel_type.name, {})
+        return SimulatedProvider(channel_type, seed=getattr(settings, 'NOTIFICATION_PROVIDER_SEED', None), **options)
+    return ConsoleProvider(channel_type)
+
+
+def get_provider(channel_type):
+    """
+    Get the provider that delivers notifications for a channel type.
+
+    Inside dry_run() a DryRunProvider is returned; otherwise the provider configured by the
+    NOTIFICATION_PROVIDER_BACKEND setting, shared by the whole process.
+
+    Args:
+        channel_type (ChannelType): The channel type.
+
+    Returns:
+        The provider, with a send(address, text) method.
+    """
+    if _dry_run.get():
+        return DryRunProvider(channel_type)
+    provider = _providers.get(channel_type)
+    if provider is None:
+        with _providers_lock:
+            provider = _providers.setdefault(channel_type, _create_provider(channel_type))
+    return provider
+
+
+def is_dry_run():
+    """
+    Check whether the current code runs inside dry_run().
+
+    Returns:
+        bool: True if notifications are delivered to a DryRunProvider.
+    """
+    return _dry_run.get()
+
+
+@contextmanager
+def dry_run():
+    """
+    Deliver every notification sent inside the block to a DryRunProvider.
+    """
+    token = _dry_run.set(True)
+    try:
+        yield
+    finally:
+        _dry_run.reset(token)
+
+
+@receiver(setting_changed)
+def reset_providers(setting, **kwargs):
+    if setting.startswith('NOTIFICATION_PROVIDER'):
+        _providers.clear()
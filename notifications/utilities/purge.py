@@ -0,0 +1,85 @@
+import time
+
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.models import Category, DeliveryRollup, GilaMessage, LogHistory
+from notifications.utilities import response_cache, rollups
+
+
+def soft_delete(instance):
+    """
+    Mark a category or message as deleted.
+
+    This is a single-row update: the rows that depend on the instance are hidden right away
+    and removed later by purge_deleted, instead of being cascaded in the request. The
+    deliveries of a deleted message are subtracted from the rollups; those of a deleted
+    category are hidden from the stats with the category.
+
+    Args:
+        instance (Category or GilaMessage): The object to delete.
+    """
+    instance.deleted_at = timezone.now()
+    if isinstance(instance, GilaMessage):
+        with transaction.atomic():
+            instance.save(update_fields=['deleted_at'])
+            rollups.subtract_message(instance)
+    else:
+        instance.save(update_fields=['deleted_at'])
+    # Deleting a category also hides its messages.
+    response_cache.invalidate(response_cache.MESSAGES)
+
+
+def _delete_in_chunks(model, queryset, chunk_size, pause, progress, stage):
+    """
+    Delete the rows of a queryset in chunks of primary keys.
+
+    Each chunk is a plain DELETE ... WHERE pk IN (...) without Django's cascade collection
+    and signals, and runs in its own transaction, so locks are held for one chunk at a time.
+
+    Returns:
+        int: The number of deleted rows.
+    """
+    using = router.db_for_write(model)
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        deleted += model._base_manager.filter(pk__in=ids)._raw_delete(using)
+        if progress:
+            progress(stage, deleted)
+        if pause:
+            time.sleep(pause)
+
+
+def purge_deleted(chunk_size=1000, pause=0.0, progress=None):
+    """
+    Permanently remove soft-deleted categories and messages with everything that depends on them.
+
+    Children are removed before their parents (log entries, messages, rollups, categories), so
+    no chunk ever needs a cascade.
+
+    Args:
+        chunk_size (int): The number of rows deleted per statement.
+        pause (float): Seconds to sleep between chunks, to leave room for other writers.
+        progress (callable): Called as progress(stage, deleted) after every chunk.
+
+    Returns:
+        dict: The number of deleted rows per stage.
+    """
+    deleted_categories = Category.all_objects.filter(deleted_at__isnull=False)
+    deleted_messages = GilaMessage.all_objects.filter(
+        Q(deleted_at__isnull=False) | Q(category__in=deleted_categories)
+    )
+    stages = (
+        ('log_history', LogHistory, LogHistory.objects.filter(message__in=deleted_messages)),
+        ('messages', GilaMessage, deleted_messages),
+        ('rollups', DeliveryRollup, DeliveryRollup.objects.filter(category__in=deleted_categories)),
+        ('categories', Category, deleted_categories),
+    )
+    return {
+        stage: _delete_in_chunks(model, queryset, chunk_size, pause, progress, stage)
+        for stage, model, queryset in stages
+    }
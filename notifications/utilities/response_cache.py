@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from notifications.utilities.db_router import is_reading_from_replica
+
+CATEGORIES = 'categories'
+MESSAGES = 'messages'
+
+
+def _version_key(prefix):
+    return 'notifications:response-cache:{}:version'.format(prefix)
+
+
+def get_version(prefix):
+    """
+    Get the current cache version for a group of responses.
+
+    Args:
+        prefix (str): The response group, e.g. CATEGORIES or MESSAGES.
+
+    Returns:
+        int: The current version.
+    """
+    version = cache.get(_version_key(prefix))
+    if version is None:
+        version = 1
+        cache.add(_version_key(prefix), version, None)
+    return version
+
+
+def invalidate(prefix):
+    """
+    Invalidate every cached response of a group.
+
+    Cached entries are not deleted one by one; bumping the version makes all keys built with
+    the previous version unreachable, and they expire on their own.
+
+    Args:
+        prefix (str): The response group, e.g. CATEGORIES or MESSAGES.
+    """
+    try:
+        cache.incr(_version_key(prefix))
+    except ValueError:
+        cache.set(_version_key(prefix), get_version(prefix) + 1, None)
+
+
+def build_key(prefix, request):
+    """
+    Build the cache key of a list response.
+
+    Responses built from the read replica are cached under their own keys. A replica response
+    may predate a write even when it is cached after the write bumped the version, so it is
+    never served to clients whose reads are pinned to the default database.
+
+    Args:
+        prefix (str): The response group, e.g. CATEGORIES or MESSAGES.
+        request (Request): The request being answered. Its host and query parameters are part of the key.
+
+    Returns:
+        str: The cache key.
+    """
+    query = '&'.join(
+        '{}={}'.format(name, ','.join(request.query_params.getlist(name)))
+        for name in sorted(request.query_params)
+    )
+    source = 'replica' if is_reading_from_replica() else 'default'
+    return 'notifications:response-cache:{}:{}:{}:{}?{}'.format(
+        prefix, get_version(prefix), source, request.get_host(), query
+    )
+
+
+def get_timeout():
+    """
+    Get how many seconds a list response stays cached.
+
+    Responses built from the read replica may miss writes that have not been replicated yet,
+    so they are only kept for REPLICA_STICKY_SECONDS.
+
+    Returns:
+        int: The NOTIFICATIONS_RESPONSE_CACHE_TIMEOUT setting, 300 by default.
+    """
+    timeout = getattr(settings, 'NOTIFICATIONS_RESPONSE_CACHE_TIMEOUT', 300)
+    if is_reading_from_replica():
+        return min(timeout, getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+    return timeout
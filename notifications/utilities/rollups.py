@@ -0,0 +1,150 @@
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, time
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from notifications.models import DeliveryRollup, LogHistory
+from notifications.utilities import providers
+
+_pending = contextvars.ContextVar('pending_deliveries', default=None)
+
+
+def _bucket(entry):
+    return timezone.localdate(entry.time), entry.message.category_id, entry.channel_type
+
+
+def record_deliveries(entries):
+    """
+    Add LogHistory entries to the delivery rollups.
+
+    Entries are grouped by (day, category, channel type) first, so a batch of log entries
+    costs one update per bucket rather than one per entry.
+
+    Args:
+        entries (Iterable[LogHistory]): The new log entries, with their message loaded.
+    """
+    _flush(Counter(_bucket(entry) for entry in entries))
+
+
+def record_delivery(entry):
+    """
+    Add a new LogHistory entry to the rollups, or to the current batch() if there is one.
+
+    Entries logged by a dry run are skipped: they are rolled back anyway, and updating the
+    rollups would lock rows that real deliveries to the category need for the whole dry run.
+
+    Args:
+        entry (LogHistory): The new log entry, with its message loaded.
+    """
+    if providers.is_dry_run():
+        return
+    pending = _pending.get()
+    if pending is None:
+        record_deliveries([entry])
+    else:
+        pending[_bucket(entry)] += 1
+
+
+@contextmanager
+def batch():
+    """
+    Collect the deliveries logged inside the block and add them to the rollups at the end.
+
+    A fan-out logs many deliveries to the same one to three buckets; batching them turns one
+    rollup update (and row lock) per delivery into one per bucket.
+    """
+    pending = Counter()
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        _flush(pending)
+
+
+def _flush(buckets):
+    for (day, category_id, channel_type), count in buckets.items():
+        increment(day, category_id, channel_type, count)
+
+
+def increment(day, category_id, channel_type, count=1):
+    """
+    Increment one rollup bucket, creating it if needed.
+
+    Args:
+        day (date): The day of the deliveries.
+        category_id (UUID): The category of the delivered message.
+        channel_type (str): The channel of the deliveries.
+        count (int): The number of deliveries to add.
+    """
+    bucket = DeliveryRollup.objects.filter(day=day, category_id=category_id, channel_type=channel_type)
+    if bucket.update(count=F('count') + count):
+        return
+    try:
+        with transaction.atomic():
+            DeliveryRollup.objects.create(day=day, category_id=category_id, channel_type=channel_type, count=count)
+    except IntegrityError:
+        # Another process created the bucket in the meantime.
+        bucket.update(count=F('count') + count)
+
+
+def subtract_message(message):
+    """
+    Remove the deliveries of a message from the rollups, e.g. when the message is deleted.
+
+    Args:
+        message (GilaMessage): The message whose logged deliveries are subtracted.
+    """
+    buckets = (
+        LogHistory.objects
+        .filter(message=message)
+        .annotate(day=TruncDate('time'))
+        .values('day', 'channel_type')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for bucket in buckets:
+        DeliveryRollup.objects.filter(
+            day=bucket['day'], category_id=message.category_id, channel_type=bucket['channel_type']
+        ).update(count=F('count') - bucket['total'])
+
+
+def rebuild(until=None):
+    """
+    Recompute the rollups of the complete days from the LogHistory table.
+
+    Deliveries of deleted messages are left out, as subtract_message does when a message is
+    deleted. Only the days before until are rebuilt. Deliveries are logged as they happen, so those
+    days no longer receive increments, and none can be lost between the aggregate read and
+    the rewrite; the current day stays incremental.
+
+    Args:
+        until (date): The first day left untouched. Defaults to today.
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    until = until or timezone.localdate()
+    start = timezone.make_aware(datetime.combine(until, time.min))
+    with transaction.atomic():
+        buckets = (
+            LogHistory.objects
+            .filter(time__lt=start, message__deleted_at__isnull=True)
+            .annotate(day=TruncDate('time'))
+            .values('day', 'message__category', 'channel_type')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        rollups = [
+            DeliveryRollup(day=bucket['day'], category_id=bucket['message__category'],
+                           channel_type=bucket['channel_type'], count=bucket['total'])
+            for bucket in buckets.iterator()
+        ]
+        DeliveryRollup.objects.filter(day__lt=until).delete()
+        DeliveryRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
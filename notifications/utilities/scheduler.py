@@ -0,0 +1,200 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from notifications.models import GilaMessage
+from notifications.utilities import live_feed, response_cache
+from notifications.utilities.notifier import new_message_notify
+
+logger = logging.getLogger(__name__)
+
+
+def pending_messages():
+    """
+    Get the scheduled messages that have not been dispatched yet.
+
+    Returns:
+        QuerySet: GilaMessage objects with a send_at time and no sent_at time.
+    """
+    return GilaMessage.objects.filter(sent_at__isnull=True, send_at__isnull=False)
+
+
+def next_due_time():
+    """
+    Get the send_at time of the earliest pending scheduled message.
+
+    The lookup is served by the partial index on pending send_at values, so it is a single
+    index probe regardless of how many messages are waiting.
+
+    Returns:
+        datetime or None: The next due time, or None if nothing is scheduled.
+    """
+    return pending_messages().order_by('send_at').values_list('send_at', flat=True).first()
+
+
+def dispatch_message(message):
+    """
+    Claim a message and notify its subscribers.
+
+    The message is claimed with a conditional update on sent_at, so when several schedulers
+    run at the same time each message is dispatched only once. If the fan-out fails, the
+    claim is released and the message is rescheduled SCHEDULER_RETRY_DELAY seconds later, so
+    the scheduler tries it again instead of leaving it marked as sent. Users notified before
+    the failure are notified again by the retry.
+
+    Args:
+        message (GilaMessage): The message to dispatch.
+
+    Returns:
+        bool: True if this call dispatched the message, False if it was already claimed or
+            its fan-out failed.
+    """
+    sent_at = timezone.now()
+    claimed = GilaMessage.objects.filter(pk=message.pk, sent_at__isnull=True).update(sent_at=sent_at)
+    if not claimed:
+        return False
+    response_cache.invalidate(response_cache.MESSAGES)
+    message.sent_at = sent_at
+    live_feed.publish(live_feed.message_status_event(message, 'sending'))
+    try:
+        new_message_notify(message)
+    except Exception:
+        logger.exception("Dispatch of message %s failed, retrying in %s seconds.",
+                         message.pk, settings.SCHEDULER_RETRY_DELAY)
+        release_message(message, sent_at)
+        live_feed.publish(live_feed.message_status_event(message, 'failed'))
+        return False
+    live_feed.publish(live_feed.message_status_event(message, 'sent'))
+    return True
+
+
+def release_message(message, sent_at):
+    """
+    Release the claim on a message whose fan-out failed and reschedule it.
+
+    Args:
+        message (GilaMessage): The claimed message.
+        sent_at (datetime): The claim time set by dispatch_message.
+    """
+    send_at = timezone.now() + timedelta(seconds=settings.SCHEDULER_RETRY_DELAY)
+    GilaMessage.objects.filter(pk=message.pk, sent_at=sent_at).update(sent_at=None, send_at=send_at)
+    response_cache.invalidate(response_cache.MESSAGES)
+    message.sent_at = None
+    message.send_at = send_at
+
+
+def dispatch_due_messages(batch_size=100, now=None):
+    """
+    Dispatch every scheduled message whose send_at time has been reached.
+
+    Due messages are fetched in batches ordered by send_at, so memory use is bounded by
+    batch_size however large the backlog is. Messages whose fan-out fails are rescheduled
+    (see dispatch_message), so they are not fetched again by the same call.
+
+    Args:
+        batch_size (int): The number of messages to fetch per query.
+        now (datetime): The reference time. Defaults to the current time.
+
+    Returns:
+        int: The number of messages dispatched.
+    """
+    now = now or timezone.now()
+    dispatched = 0
+    while True:
+        batch = list(
+            pending_messages()
+            .filter(send_at__lte=now)
+            .select_related('category')
+            .order_by('send_at')[:batch_size]
+        )
+        for message in batch:
+            if dispatch_message(message):
+                dispatched += 1
+        if len(batch) < batch_size:
+            return dispatched
+
+
+class MessageScheduler:
+    """
+    Worker that dispatches scheduled messages when they become due.
+
+    Instead of scanning the table at a fixed rate, the worker sleeps until the next due time.
+    Messages are scheduled by other processes (the web server), which can't wake the worker,
+    so the sleep is capped at max_idle seconds: a new message is picked up at most that late.
+    The check is a single probe of the partial index on pending messages, so a short cap is
+    cheap. Callers in the same process can call wake() to re-check immediately. Live feed events are
+    published in the worker's own process, so when it runs as `manage.py run_scheduler` they
+    reach no subscriber.
+
+    Attributes:
+        batch_size (int): The number of due messages fetched per query.
+        max_idle (float): The maximum number of seconds to sleep between checks.
+    """
+
+    def __init__(self, batch_size=100, max_idle=1.0):
+        self.batch_size = batch_size
+        self.max_idle = max_idle
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+
+    def seconds_until_next_due(self, now=None):
+        """
+        Compute how long the worker can sleep before the next message is due.
+
+        Args:
+            now (datetime): The reference time. Defaults to the current time.
+
+        Returns:
+            float: The number of seconds to sleep, between 0 and max_idle.
+        """
+        due = next_due_time()
+        if due is None:
+            return self.max_idle
+        now = now or timezone.now()
+        return min(max((due - now).total_seconds(), 0.0), self.max_idle)
+
+    def run_once(self):
+        """
+        Dispatch due messages and return how long to sleep before the next check.
+
+        Returns:
+            float: The number of seconds until the next check.
+        """
+        close_old_connections()
+        dispatched = dispatch_due_messages(self.batch_size)
+        if dispatched:
+            logger.info("Dispatched %s scheduled message(s).", dispatched)
+        return self.seconds_until_next_due()
+
+    def run(self):
+        """
+        Run the scheduler loop until stop() is called.
+
+        Errors of a check, such as a lost database connection, are logged and the check is
+        retried after max_idle seconds, so the worker keeps running.
+        """
+        while not self._stop_event.is_set():
+            try:
+                timeout = self.run_once()
+            except Exception:
+                logger.exception("Scheduler check failed, retrying in %s seconds.", self.max_idle)
+                timeout = self.max_idle
+            self._wake_event.wait(timeout)
+            self._wake_event.clear()
+
+    def wake(self):
+        """
+        Interrupt the current sleep so the worker re-checks for due messages.
+        """
+        self._wake_event.set()
+
+    def stop(self):
+        """
+        Stop the scheduler loop.
+        """
+        self._stop_event.set()
+        self._wake_event.set()
@@ -0,0 +1,162 @@
+import re
+from collections import defaultdict
+
+from django.db import connections, router
+from django.db.models import BooleanField, Count, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+
+from notifications.models import GilaMessage, LogHistory
+
+SEARCH_CONFIG = 'english'
+MAX_RECIPIENTS = 10
+# A double-quoted phrase (the closing quote is optional, as in websearch_to_tsquery), or a word.
+QUERY_TERM = re.compile(r'"([^"]*)"?|(\S+)')
+FTS_TABLE = 'notifications_gilamessage_search'
+# Earlier FTS5 table, keyed on rowid; dropped by ensure_search_index.
+OLD_FTS_TABLE = 'notifications_gilamessage_fts'
+GIN_INDEX = 'notifications_gilamessage_search'
+
+# The FTS5 table keeps its own copy of each message with the message id, instead of pointing to
+# the messages' rowids: the table has a UUID primary key, so VACUUM may renumber its rowids.
+SQLITE_INDEX_SQL = [
+    "DROP TRIGGER IF EXISTS {old_fts}_insert",
+    "DROP TRIGGER IF EXISTS {old_fts}_delete",
+    "DROP TRIGGER IF EXISTS {old_fts}_update",
+    "DROP TABLE IF EXISTS {old_fts}",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(message, message_id UNINDEXED)",
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts}(message, message_id) VALUES (new.message, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+        DELETE FROM {fts} WHERE message_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF message ON {table} BEGIN
+        DELETE FROM {fts} WHERE message_id = old.id;
+        INSERT INTO {fts}(message, message_id) VALUES (new.message, new.id);
+    END
+    """,
+    # Rebuilt from the messages every time, so rows written while the triggers were missing are indexed too.
+    "DELETE FROM {fts}",
+    "INSERT INTO {fts}(message, message_id) SELECT message, id FROM {table}",
+]
+
+POSTGRESQL_INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS {index} ON {table} USING GIN (to_tsvector('{config}', message))",
+]
+
+
+def ensure_search_index(using='default'):
+    """
+    Create the full-text index over GilaMessage.message if it doesn't exist.
+
+    PostgreSQL gets a GIN index on the message tsvector, which the database keeps up to date.
+    SQLite gets an FTS5 table kept up to date by triggers on insert, update and delete, and
+    rebuilt from the messages by every call. Other databases have no index, and search falls
+    back to a substring scan.
+
+    Args:
+        using (str): The database alias.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        statements = POSTGRESQL_INDEX_SQL
+    elif connection.vendor == 'sqlite':
+        statements = SQLITE_INDEX_SQL
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement.format(
+                fts=FTS_TABLE, old_fts=OLD_FTS_TABLE, index=GIN_INDEX, table=GilaMessage._meta.db_table, config=SEARCH_CONFIG
+            ))
+
+
+def _fts5_query(text):
+    """
+    Turn free text into an FTS5 query matching every word and double-quoted phrase.
+
+    Like websearch_to_tsquery on PostgreSQL, a quoted phrase matches its words in order and
+    next to each other. FTS5 operators in the text are matched as plain words.
+    """
+    terms = []
+    for phrase, word in QUERY_TERM.findall(text):
+        term = ' '.join(phrase.split()) if phrase else word
+        if term:
+            terms.append('"{}"'.format(term.replace('"', '""')))
+    return ' '.join(terms)
+
+
+def search_messages(text):
+    """
+    Search the messages containing the given words, best matches first.
+
+    Args:
+        text (str): The words to look for.
+
+    Returns:
+        QuerySet: GilaMessage objects annotated with a 'rank' (higher is better), ordered by rank.
+    """
+    queryset = GilaMessage.objects.all()
+    vendor = connections[router.db_for_read(GilaMessage)].vendor
+    table = GilaMessage._meta.db_table
+    if vendor == 'postgresql':
+        document = "to_tsvector('{config}', {table}.message)".format(config=SEARCH_CONFIG, table=table)
+        query = "websearch_to_tsquery('{config}', %s)".format(config=SEARCH_CONFIG)
+        queryset = queryset.filter(
+            RawSQL('{} @@ {}'.format(document, query), [text], output_field=BooleanField())
+        ).annotate(rank=RawSQL('ts_rank({}, {})'.format(document, query), [text], output_field=FloatField()))
+    elif vendor == 'sqlite':
+        # The FTS table is joined once; bm25() is lower for better matches.
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=['{fts}.message_id = {table}.id'.format(fts=FTS_TABLE, table=table),
+                   '{fts} MATCH %s'.format(fts=FTS_TABLE)],
+            params=[_fts5_query(text)],
+            select={'rank': '-bm25({fts})'.format(fts=FTS_TABLE)},
+        )
+    else:
+        queryset = queryset.filter(message__icontains=text).annotate(rank=Value(0.0, output_field=FloatField()))
+    return queryset.order_by('-rank', 'pk')
+
+
+def load_recipients(messages, limit=MAX_RECIPIENTS):
+    """
+    Get the first users each message was delivered to, and how many there were.
+
+    A broadcast can have millions of deliveries, so only the first limit log entries of each
+    message are read, in two queries however many messages are given: one for the counts and
+    the id of each message's last listed entry, one for the listed entries.
+
+    Args:
+        messages (Iterable[GilaMessage]): The messages.
+        limit (int): The maximum number of recipients listed per message.
+
+    Returns:
+        dict: (recipients, count) per message id, where recipients lists the user and
+            channel_type of the first deliveries.
+    """
+    sent = LogHistory.objects.filter(message=OuterRef('pk'), status=LogHistory.SENT)
+    bounds = GilaMessage.all_objects.filter(pk__in=[message.pk for message in messages]).annotate(
+        last_listed=Subquery(sent.order_by('pk').values('pk')[limit - 1:limit]),
+        recipient_count=Subquery(
+            sent.order_by().values('message').annotate(total=Count('pk')).values('total')
+        ),
+    ).values_list('pk', 'last_listed', 'recipient_count')
+
+    recipients = defaultdict(list)
+    counts = {}
+    listed = Q()
+    for message_id, last_listed, recipient_count in bounds:
+        counts[message_id] = recipient_count or 0
+        if recipient_count:
+            listed |= Q(message=message_id, pk__lte=last_listed) if last_listed else Q(message=message_id)
+    if listed:
+        deliveries = LogHistory.objects.filter(listed, status=LogHistory.SENT).order_by('pk')
+        for message_id, user, channel_type in deliveries.values_list('message_id', 'user', 'channel_type'):
+            recipients[message_id].append({'user': user, 'channel_type': channel_type})
+    return {message_id: (recipients[message_id], count) for message_id, count in counts.items()}
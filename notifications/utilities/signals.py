@@ -1,14 +1,39 @@
 import uuid
 from sqlite3 import OperationalError
 
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_save, post_delete
 from django.dispatch import receiver
 
-from notifications.models import Category
-from notifications.utilities.local_data import LocalDataHandler
+from notifications.models import Category, GilaMessage, LogHistory
+from notifications.utilities import live_feed, providers, response_cache, rollups, search
+from notifications.utilities.local_data import seed_categories
 
 
 @receiver(post_migrate)
-def load_initial_data(**kwargs):
-    local_data_handler = LocalDataHandler()
-    local_data_handler.load_categories()
+def load_initial_data(sender, using='default', **kwargs):
+    if sender.name == 'notifications':
+        seed_categories(using=using)
+        search.ensure_search_index(using=using)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_responses(**kwargs):
+    response_cache.invalidate(response_cache.CATEGORIES)
+
+
+@receiver([post_save, post_delete], sender=GilaMessage)
+def invalidate_message_responses(**kwargs):
+    response_cache.invalidate(response_cache.MESSAGES)
+
+
+@receiver(post_save, sender=LogHistory)
+def publish_delivery(instance, created, **kwargs):
+    # Dry runs are rolled back, so their deliveries are never streamed.
+    if created and not providers.is_dry_run():
+        live_feed.publish(live_feed.delivery_event(instance))
+
+
+@receiver(post_save, sender=LogHistory)
+def update_delivery_rollups(instance, created, **kwargs):
+    if created:
+        rollups.record_delivery(instance)
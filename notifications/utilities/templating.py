@@ -0,0 +1,181 @@
+import string
+from functools import lru_cache
+
+PLACEHOLDERS = ('user_name', 'category')
+TEMPLATE_CACHE_SIZE = 1024
+
+# Maximum rendered length per ChannelType name. Channels without an entry (E-Mail) get the full text.
+MAX_LENGTHS = {
+    'SMS': 160,
+    'PUSH_NOTIFICATION': 240,
+}
+ELLIPSIS = '…'
+
+# An SMS fits in one 160-character part only if it is written in the GSM 03.38 (GSM-7) alphabet, where the extension
+# characters take two places. Any other character sends the whole SMS as UCS-2, limited to 70 characters per part.
+SMS_ELLIPSIS = '...'
+SMS_UCS2_MAX_LENGTH = 70
+GSM7_BASIC = frozenset(
+    '@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !"#¤%&\'()*+,-./0123456789:;<=>?'
+    '¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà'
+)
+GSM7_EXTENDED = frozenset('\f^{}\\[~]|€')
+
+
+class CompiledTemplate:
+    """
+    A message template parsed into literal text and placeholders.
+
+    Parsing happens once, when the template is compiled; render() only joins the literal parts
+    with the placeholder values and applies the channel's length limit.
+
+    Attributes:
+        segments (tuple): (literal, placeholder) pairs; placeholder is None for the trailing literal.
+        max_length (int or None): The maximum rendered length, or None for no limit.
+        static_text (str or None): The final text when the template has no placeholders.
+        sms (bool): Whether the text is an SMS, truncated to one part by truncate_sms instead.
+    """
+    __slots__ = ('segments', 'max_length', 'static_text', 'sms')
+
+    def __init__(self, segments, max_length=None, sms=False):
+        self.segments = segments
+        self.max_length = max_length
+        self.sms = sms
+        self.static_text = None
+        if all(placeholder is None for _, placeholder in segments):
+            self.static_text = self._truncate(''.join(literal for literal, _ in segments))
+
+    def _truncate(self, text):
+        if self.sms:
+            return truncate_sms(text)
+        if self.max_length is not None and len(text) > self.max_length:
+            return text[:self.max_length - len(ELLIPSIS)] + ELLIPSIS
+        return text
+
+    def render(self, **context):
+        """
+        Render the template.
+
+        Args:
+            **context: The placeholder values, e.g. user_name and category.
+
+        Returns:
+            str: The rendered text, truncated to max_length.
+        """
+        if self.static_text is not None:
+            return self.static_text
+        parts = []
+        for literal, placeholder in self.segments:
+            parts.append(literal)
+            if placeholder is not None:
+                parts.append(str(context.get(placeholder, '')))
+        return self._truncate(''.join(parts))
+
+
+def truncate_sms(text):
+    """
+    Truncate a text to a single SMS part.
+
+    GSM-7 texts are cut to 160 places, counting extension characters twice; any other text is
+    cut to 70 UTF-16 code units, since it is sent as UCS-2 (characters outside the Basic
+    Multilingual Plane, such as emoji, take two and are never split). The ellipsis is ASCII, so
+    truncating never turns a GSM-7 text into a UCS-2 one.
+
+    Args:
+        text (str): The rendered SMS text.
+
+    Returns:
+        str: The text, truncated with '...' if it does not fit in one part.
+    """
+    sizes = []
+    for character in text:
+        if character in GSM7_BASIC:
+            sizes.append(1)
+        elif character in GSM7_EXTENDED:
+            sizes.append(2)
+        else:
+            return _truncate_units(text, [_utf16_units(character) for character in text], SMS_UCS2_MAX_LENGTH)
+    return _truncate_units(text, sizes, MAX_LENGTHS['SMS'])
+
+
+def _utf16_units(character):
+    return 2 if ord(character) > 0xFFFF else 1
+
+
+def _truncate_units(text, sizes, max_units):
+    """
+    Truncate a text whose characters take the given number of units each to max_units, ellipsis included.
+    """
+    if sum(sizes) <= max_units:
+        return text
+    budget = max_units - len(SMS_ELLIPSIS)
+    length = 0
+    for index, size in enumerate(sizes):
+        if budget < size:
+            break
+        budget -= size
+        length = index + 1
+    return text[:length] + SMS_ELLIPSIS
+
+
+def _parse(text):
+    """
+    Split a template into (literal, placeholder) segments.
+
+    Only the names in PLACEHOLDERS are substituted; any other {field} is kept as written.
+    Text that is not a valid format string is treated as a single literal.
+    """
+    segments = []
+    literal = ''
+    try:
+        parsed = list(string.Formatter().parse(text))
+    except ValueError:
+        return ((text, None),)
+    for literal_text, field_name, format_spec, conversion in parsed:
+        literal += literal_text
+        if field_name is None:
+            continue
+        if field_name in PLACEHOLDERS and not format_spec and not conversion:
+            segments.append((literal, field_name))
+            literal = ''
+        else:
+            literal += '{' + field_name + ('!' + conversion if conversion else '') + \
+                       (':' + format_spec if format_spec else '') + '}'
+    segments.append((literal, None))
+    return tuple(segments)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(text, channel_type):
+    """
+    Compile a message text for a channel type.
+
+    Results are kept in an LRU cache, so a message is parsed once per channel type no matter
+    how many recipients it is sent to.
+
+    Args:
+        text (str): The message text, with optional {user_name} and {category} placeholders.
+        channel_type (ChannelType): The channel the text is rendered for.
+
+    Returns:
+        CompiledTemplate: The compiled template.
+    """
+    return CompiledTemplate(_parse(text), MAX_LENGTHS.get(channel_type.name), sms=channel_type.name == 'SMS')
+
+
+def render_message(message, channel_type, user_name):
+    """
+    Render a GilaMessage for one recipient and channel.
+
+    Args:
+        message (GilaMessage): The message to render.
+        channel_type (ChannelType): The channel the text is rendered for.
+        user_name (str): The name of the recipient.
+
+    Returns:
+        str: The rendered text.
+    """
+    template = compile_template(message.message, channel_type)
+    if template.static_text is not None:
+        return template.static_text
+    return template.render(user_name=user_name, category=message.category.name)
@@ -1,13 +1,61 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.dateparse import parse_date
 from rest_framework import generics, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework import status
 from rest_framework.response import Response
 
-from .models import Category, GilaMessage, LogHistory
-from .serializers import CategorySerializer, MessageSerializer, LogHistorySerializer
-from .utilities.notifier import new_message_notify
+from .models import Category, GilaMessage, LogHistory, DeliveryRollup
+from .pagination import LogHistoryPagination, MessagePagination
+from .serializers import CategorySerializer, MessageSerializer, LogHistorySerializer, CategoryReadSerializer, \
+    MessageReadSerializer, DeliveryRollupSerializer, MessageSearchSerializer
+from .utilities import idempotency, response_cache
+from .utilities.planner import plan_dispatch
+from .utilities.purge import soft_delete
+from .utilities.search import load_recipients, search_messages
+from .utilities.scheduler import dispatch_message
+
+
+class CachedValuesListMixin:
+    """
+    Mixin that serves list requests from values() rows and caches the response.
+
+    Responses are cached per query string and invalidated whenever an object of the
+    group is saved or deleted (see notifications.utilities.signals).
+
+    Attributes:
+        read_serializer_class (ValuesSerializer): The read-only serializer used for listing.
+        cache_prefix (str): The response cache group of the view.
+    """
+    read_serializer_class = None
+    cache_prefix = None
+
+    def list(self, request, *args, **kwargs):
+        key = response_cache.build_key(self.cache_prefix, request)
+        data = cache.get(key)
+        if data is None:
+            data = self.get_list_data()
+            cache.set(key, data, response_cache.get_timeout())
+        return Response(data)
 
+    def get_list_data(self):
+        """
+        Serialize the (paginated) queryset of the view.
 
-class CategoryListCreateView(generics.ListCreateAPIView):
+        Returns:
+            list or dict: The serialized rows, wrapped in the pagination envelope when paginated.
+        """
+        rows = self.read_serializer_class.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.read_serializer_class(page).data).data
+        return self.read_serializer_class(rows).data
+
+
+class CategoryListCreateView(CachedValuesListMixin, generics.ListCreateAPIView):
     """
     API view for listing and creating Category objects.
 
@@ -18,9 +66,12 @@ class CategoryListCreateView(generics.ListCreateAPIView):
         queryset (QuerySet): The queryset of Category objects to be listed.
         serializer_class (CategorySerializer): The serializer class to convert
             Category objects to JSON representation and vice versa.
+        read_serializer_class (CategoryReadSerializer): The read-only serializer used for listing.
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    read_serializer_class = CategoryReadSerializer
+    cache_prefix = response_cache.CATEGORIES
 
 
 class CategoryRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
@@ -35,31 +86,104 @@ class CategoryRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
             the specific Category object.
         serializer_class (CategorySerializer): The serializer class to convert
             Category objects to JSON representation and vice versa.
+
+    Deleting a category only marks it (and so its messages) as deleted; the rows are removed
+    later by `manage.py purge_deleted`.
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
+    def perform_destroy(self, instance):
+        soft_delete(instance)
+
+
+class CategoryDispatchPlanView(generics.RetrieveAPIView):
+    """
+    API view for planning the fan-out of a message in a specific Category.
+
+    The CategoryDispatchPlanView is a dry run: it reports how many users and provider calls a
+    message of the category would reach, per channel type, and whether it would be sent
+    inline or in shards, without sending or storing anything.
+
+    Attributes:
+        queryset (QuerySet): The queryset of Category objects from which to retrieve
+            the specific Category object.
+    """
+    queryset = Category.objects.all()
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(plan_dispatch(self.get_object()).as_dict())
+
 
-class MessageListCreateView(generics.ListCreateAPIView):
+class MessageListCreateView(CachedValuesListMixin, generics.ListCreateAPIView):
     """
     API view for listing and creating Message objects.
 
     The MessageListCreateView is a generic view that handles listing all existing
-    Message objects and creating new Message objects.
+    Message objects and creating new Message objects. Messages without a future
+    send_at time are dispatched immediately; the others are left for the scheduler.
+    Clients can send an Idempotency-Key header to retry a creation safely: a repeated key
+    returns the original response, or the created message while it is still being dispatched,
+    without creating or dispatching the message again.
 
     Attributes:
         queryset (QuerySet): The queryset of Message objects to be listed.
         serializer_class (MessageSerializer): The serializer class to convert
             Message objects to JSON representation and vice versa.
+        read_serializer_class (MessageReadSerializer): The read-only serializer used for listing.
+        pagination_class (MessagePagination): The pagination applied to the list.
     """
-    queryset = GilaMessage.objects.all()
+    queryset = GilaMessage.objects.order_by('pk')
     serializer_class = MessageSerializer
+    read_serializer_class = MessageReadSerializer
+    pagination_class = MessagePagination
+    cache_prefix = response_cache.MESSAGES
 
     def post(self, request, *args, **kwargs):
+        key = request.headers.get(idempotency.HEADER)
+        if not key:
+            return self.create_message(request)
+        if len(key) > idempotency.MAX_KEY_LENGTH:
+            return Response({'detail': 'The {} header is too long.'.format(idempotency.HEADER)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = idempotency.hash_request(request.body)
+        record, created = idempotency.reserve(key, request_hash)
+        if not created:
+            return idempotency.replay(record, request_hash)
+        try:
+            response = self.create_message(request, record)
+        except Exception:
+            idempotency.release(record)
+            raise
+        idempotency.store_response(record, response)
+        return response
+
+    def create_message(self, request, record=None):
+        """
+        Create a message and dispatch it if it is due.
+
+        Args:
+            request (Request): The POST request.
+            record (IdempotencyKey): The key reserved by the request, if any. The message is
+                stored on it in the transaction that creates the message.
+
+        Returns:
+            Response: 201 with the created message, 400 with the validation errors, or 409 if
+                the key was taken over by another request before the message was created.
+        """
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            message = serializer.save()
-            new_message_notify(message)
+            with transaction.atomic():
+                message = serializer.save()
+                if record is not None and not idempotency.record_message(record, message):
+                    transaction.set_rollback(True)
+                    return Response(
+                        {'detail': 'A request with this {} is still being processed.'.format(idempotency.HEADER)},
+                        status=status.HTTP_409_CONFLICT,
+                    )
+            if message.is_due():
+                dispatch_message(message)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -76,10 +200,16 @@ class MessageRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
             the specific Message object.
         serializer_class (MessageSerializer): The serializer class to convert
             Message objects to JSON representation and vice versa.
+
+    Deleting a message only marks it as deleted; it is removed with its log entries later by
+    `manage.py purge_deleted`.
     """
     queryset = GilaMessage.objects.all()
     serializer_class = MessageSerializer
 
+    def perform_destroy(self, instance):
+        soft_delete(instance)
+
 
 class LogHistoryViewSet(viewsets.ModelViewSet):
     """
@@ -91,7 +221,83 @@ class LogHistoryViewSet(viewsets.ModelViewSet):
     Attributes:
         queryset (QuerySet): The queryset of User objects to be listed, retrieved, etc.
         serializer_class (UserSerializer): The serializer class to convert User objects to JSON representation and vice versa.
+        pagination_class (LogHistoryPagination): Cursor pagination over the time-ordered primary key.
     """
 
-    queryset = LogHistory.objects.all()
+    queryset = LogHistory.objects.filter(
+        message__deleted_at__isnull=True, message__category__deleted_at__isnull=True
+    ).select_related('message')
     serializer_class = LogHistorySerializer
+    pagination_class = LogHistoryPagination
+
+
+class DeliveryStatsView(generics.ListAPIView):
+    """
+    API view for listing delivery counts per day, category and channel type.
+
+    The DeliveryStatsView serves the pre-aggregated DeliveryRollup rows, so its cost depends on
+    the number of days, categories and channels requested, not on the size of the log.
+    Deliveries of deleted messages and categories are not counted.
+    Results can be filtered with the category, channel_type, since and until (YYYY-MM-DD)
+    query parameters.
+
+    Attributes:
+        queryset (QuerySet): The queryset of DeliveryRollup objects to be listed.
+        serializer_class (DeliveryRollupSerializer): The serializer class to convert
+            DeliveryRollup objects to JSON representation.
+    """
+    queryset = DeliveryRollup.objects.filter(category__deleted_at__isnull=True).order_by(
+        'day', 'category', 'channel_type'
+    )
+    serializer_class = DeliveryRollupSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if params.get('category'):
+            try:
+                queryset = queryset.filter(category_id=uuid.UUID(params['category']))
+            except ValueError:
+                raise ValidationError({'category': 'Must be a valid UUID.'})
+        if params.get('channel_type'):
+            queryset = queryset.filter(channel_type=params['channel_type'])
+        for name, lookup in (('since', 'day__gte'), ('until', 'day__lte')):
+            if params.get(name):
+                try:
+                    day = parse_date(params[name])
+                except ValueError:
+                    day = None
+                if day is None:
+                    raise ValidationError({name: 'Use the YYYY-MM-DD format.'})
+                queryset = queryset.filter(**{lookup: day})
+        return queryset
+
+
+class MessageSearchView(generics.ListAPIView):
+    """
+    API view for full-text search over messages and their recipients.
+
+    The MessageSearchView returns the messages matching the words of the q query parameter,
+    best matches first, each with the first users it was delivered to and their number. Matching uses the full-text
+    index maintained on GilaMessage.message (see notifications.utilities.search).
+
+    Attributes:
+        serializer_class (MessageSearchSerializer): The serializer class to convert
+            search results to JSON representation.
+        pagination_class (MessagePagination): The pagination applied to the results.
+    """
+    serializer_class = MessageSearchSerializer
+    pagination_class = MessagePagination
+
+    def get_queryset(self):
+        text = self.request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({'q': 'This query parameter is required.'})
+        return search_messages(text)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        context = self.get_serializer_context()
+        context['recipients'] = load_recipients(page)
+        serializer = self.get_serializer(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)